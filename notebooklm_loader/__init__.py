@@ -7,6 +7,7 @@ from .config import Config
 from .logger import setup_logging
 from .summary import ProcessingSummary, FileResult
 from .merger import MergedOutputManager
+from .writer import BackgroundWriter
 from .state import ProcessingState
 from .main import run
 
@@ -16,6 +17,7 @@ __all__ = [
     'ProcessingSummary',
     'FileResult',
     'MergedOutputManager',
+    'BackgroundWriter',
     'ProcessingState',
     'run',
 ]
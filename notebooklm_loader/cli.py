@@ -22,6 +22,7 @@ Examples:
   %(prog)s /path/to/folder --dry-run          # 実行計画のみ表示
   %(prog)s /path/to/folder --config config.yaml  # 設定ファイル使用
   %(prog)s /path/to/folder --incremental      # 差分処理モード
+  %(prog)s /path/to/folder --jobs 4           # 4スレッドで並列変換
         """
     )
     # 基本引数
@@ -30,6 +31,9 @@ Examples:
     # 出力オプション
     parser.add_argument('--merge', action='store_true', 
                         help='Also create merged output in converted_files_merged directory')
+    parser.add_argument('--merge-mode', choices=['hardlink', 'symlink', 'copy'], default=None,
+                        help='How PDFs are placed in the merged directory (default: hardlink, '
+                             'falls back to copy across filesystems)')
     parser.add_argument('--output-dir', '-o', type=str, default=None,
                         help='Custom output directory (default: converted_files in target)')
     
@@ -40,6 +44,9 @@ Examples:
                         help='Process only new/modified files (default behavior)')
     parser.add_argument('--full-rebuild', action='store_true',
                         help='Force reprocess all files, ignore cache')
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help='Number of parallel conversions; MarkItDown runs in as many worker processes '
+                             '(default: min(8, CPU count), 1 = sequential)')
     
     # ログ・表示オプション
     parser.add_argument('-v', '--verbose', action='store_true',
@@ -48,6 +55,8 @@ Examples:
                         help='Suppress console output and progress bar')
     parser.add_argument('--dry-run', action='store_true',
                         help='Show what would be processed without actually converting')
+    parser.add_argument('--pretty-report', action='store_true',
+                        help='Write processing_report.json with indentation (larger and slower)')
     
     # 設定オプション
     parser.add_argument('--config', '-c', type=str, default=None,
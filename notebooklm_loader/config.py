@@ -1,9 +1,11 @@
 # notebooklm_loader/config.py
 """設定管理モジュール"""
 
+import os
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Set, Optional
+from typing import Dict, Set, Optional
 
 try:
     import yaml
@@ -19,13 +21,17 @@ class Config:
     
     Attributes:
         max_file_size_mb: スキップする最大ファイルサイズ（MB）
-        merge_volume_mb: マージボリュームの最大サイズ（MB）
+        merge_volume_mb: マージボリュームの最大サイズ（MB, UTF-8バイト数で判定）
         visual_density_threshold: 視覚密度判定の閾値
         verbose: 詳細ログ出力
         quiet: コンソール出力抑制
         dry_run: 実行計画のみ表示
         merge: マージモード有効
         skip_ppt: PowerPointスキップ
+        jobs: ファイル変換の並列スレッド数（1なら逐次処理）
+        pretty_report: 処理レポート（JSON）をインデント付きで出力
+        merge_mode: マージディレクトリへのPDFの置き方（hardlink / symlink / copy）
+        full_rebuild: 前回実行時の判定結果キャッシュと変換済みPDFを使わずに全ファイルを処理し直す
     """
     # ファイル処理設定
     max_file_size_mb: int = 100
@@ -39,6 +45,10 @@ class Config:
     dry_run: bool = False
     merge: bool = False
     skip_ppt: bool = False
+    jobs: int = field(default_factory=lambda: min(8, os.cpu_count() or 1))
+    pretty_report: bool = False
+    merge_mode: str = "hardlink"
+    full_rebuild: bool = False
     
     # 拡張子設定
     office_extensions_new: Set[str] = field(default_factory=lambda: {'.docx', '.xlsx', '.pptx', '.xls'})
@@ -66,11 +76,44 @@ class Config:
         """全Office拡張子"""
         return self.office_extensions_new | self.office_extensions_legacy
     
+    @cached_property
+    def extension_map(self) -> Dict[str, str]:
+        """
+        拡張子から処理カテゴリへの対応表
+        
+        ファイルごとに各拡張子セットを順に調べる代わりに、1回の辞書引きで
+        処理方法を決める。複数のセットに含まれる拡張子は処理の優先順位が
+        高いカテゴリになる（skip > archive > office_new > pdf > office_legacy
+        > markitdown > visio > image > text）。
+        設定の読み込み完了後（処理開始時）に初めて参照されることを前提にキャッシュする。
+        
+        Returns:
+            {拡張子: カテゴリ名} の辞書（未登録の拡張子はテキスト判定の対象）
+        """
+        categories = [
+            ('text', self.text_extensions),
+            ('image', self.image_extensions),
+            ('visio', self.visio_extensions),
+            ('markitdown', self.markitdown_extensions),
+            ('office_legacy', self.office_extensions_legacy),
+            ('pdf', {'.pdf'}),
+            ('office_new', self.office_extensions_new),
+            ('archive', self.archive_extensions),
+            ('skip', self.skip_extensions),
+        ]
+        # 優先順位の低いものから登録し、高いもので上書きする
+        return {ext: category for category, exts in categories for ext in exts}
+    
     @property
     def max_file_size(self) -> int:
         """最大ファイルサイズ（バイト）"""
         return self.max_file_size_mb * 1024 * 1024
     
+    @property
+    def merge_volume_size(self) -> int:
+        """マージボリュームの最大サイズ（バイト）"""
+        return self.merge_volume_mb * 1024 * 1024
+    
     @property
     def get_max_chars_per_volume(self) -> int:
         """マージボリュームの最大文字数（設定値を優先）"""
@@ -119,7 +162,15 @@ class Config:
             dry_run=getattr(args, 'dry_run', False),
             merge=getattr(args, 'merge', False),
             skip_ppt=getattr(args, 'skip_ppt', False),
+            pretty_report=getattr(args, 'pretty_report', False),
+            full_rebuild=getattr(args, 'full_rebuild', False),
         )
+        merge_mode = getattr(args, 'merge_mode', None)
+        if merge_mode:
+            config.merge_mode = merge_mode
+        jobs = getattr(args, 'jobs', None)
+        if jobs:
+            config.jobs = max(1, jobs)
         
         # --configオプションで設定ファイルが指定された場合
         config_path = getattr(args, 'config', None)
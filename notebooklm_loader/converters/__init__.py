@@ -1,15 +1,15 @@
 # notebooklm_loader/converters/__init__.py
 """ファイル変換モジュール"""
 
-from .office_converter import analyze_docx, analyze_xlsx, analyze_pptx, convert_with_markitdown
+from .office_converter import analyze_markdown, estimate_office_density, convert_with_markitdown
 from .image_converter import convert_image_to_pdf
-from .pdf_converter import convert_to_pdf_via_libreoffice
+from .pdf_converter import convert_to_pdf_via_libreoffice, convert_batch_via_libreoffice
 
 __all__ = [
-    'analyze_docx',
-    'analyze_xlsx',
-    'analyze_pptx',
+    'analyze_markdown',
+    'estimate_office_density',
     'convert_with_markitdown',
     'convert_image_to_pdf',
     'convert_to_pdf_via_libreoffice',
+    'convert_batch_via_libreoffice',
 ]
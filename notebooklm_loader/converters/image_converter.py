@@ -10,31 +10,89 @@ try:
 except ImportError:
     HAS_PIL = False
 
+# PDFに変換する際の解像度（dpi）
+PDF_RESOLUTION = 100.0
+
+# 元データをそのまま埋め込めるJPEGの色モードとPDFの色空間
+_JPEG_COLOR_SPACES = {'RGB': 'DeviceRGB', 'L': 'DeviceGray'}
+
 
 def convert_image_to_pdf(input_path: Path, output_dir_path: Path) -> Optional[Path]:
     """
     画像ファイルをPDFに変換する
-    
+
+    RGB・グレースケールのJPEGは画素をデコードせず、元のJPEGデータをそのままPDFに埋め込む
+    （Pillowは保存時に必ずJPEGを再エンコードするため、時間がかかり画質も落ちる）。
+
     Args:
         input_path: 入力画像ファイルのパス
         output_dir_path: 出力ディレクトリ
-        
+
     Returns:
         生成されたPDFファイルのパス、失敗時はNone
     """
     if not HAS_PIL:
         print(f"    [Warning] Pillow not installed, skipping image: {input_path.name}")
         return None
-    
+
     try:
-        img = Image.open(input_path)
-        # RGBAの場合はRGBに変換（PDF保存のため）
-        if img.mode in ('RGBA', 'LA', 'P'):
-            img = img.convert('RGB')
-        
         output_pdf = output_dir_path / (input_path.stem + ".pdf")
-        img.save(output_pdf, "PDF", resolution=100.0)
+        with Image.open(input_path) as img:
+            color_space = _JPEG_COLOR_SPACES.get(img.mode) if img.format == 'JPEG' else None
+            if color_space:
+                _write_jpeg_pdf(input_path, img.size, color_space, output_pdf)
+                return output_pdf
+            # RGBAの場合はRGBに変換（PDF保存のため）
+            if img.mode in ('RGBA', 'LA', 'P'):
+                img = img.convert('RGB')
+            img.save(output_pdf, "PDF", resolution=PDF_RESOLUTION)
         return output_pdf
     except Exception as e:
         print(f"    [Image to PDF Error] {e}")
         return None
+
+
+def _write_jpeg_pdf(jpeg_path: Path, size, color_space: str, output_pdf: Path):
+    """
+    JPEGファイルを画像1枚だけの1ページのPDFとして書き出す
+
+    JPEGデータはDCTDecodeのストリームとしてそのまま埋め込む。
+    ページサイズは Pillow で PDF_RESOLUTION を指定して保存した場合と同じにする。
+
+    Args:
+        jpeg_path: JPEGファイルのパス
+        size: 画像の (幅, 高さ)（ピクセル）
+        color_space: PDFの色空間名
+        output_pdf: 出力PDFのパス
+    """
+    width, height = size
+    page_width = width * 72.0 / PDF_RESOLUTION
+    page_height = height * 72.0 / PDF_RESOLUTION
+    data = jpeg_path.read_bytes()
+    contents = f"q {page_width:g} 0 0 {page_height:g} 0 0 cm /image Do Q".encode('ascii')
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {page_width:g} {page_height:g}] "
+         f"/Resources << /ProcSet [/PDF /ImageC /ImageB] /XObject << /image 4 0 R >> >> "
+         f"/Contents 5 0 R >>").encode('ascii'),
+        (f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+         f"/ColorSpace /{color_space} /BitsPerComponent 8 /Filter /DCTDecode /Length {len(data)} >>\n"
+         f"stream\n").encode('ascii') + data + b"\nendstream",
+        f"<< /Length {len(contents)} >>\nstream\n".encode('ascii') + contents + b"\nendstream",
+    ]
+
+    with open(output_pdf, 'wb') as f:
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(f"{number} 0 obj\n".encode('ascii'))
+            f.write(body)
+            f.write(b"\nendobj\n")
+        xref_offset = f.tell()
+        f.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('ascii'))
+        for offset in offsets:
+            f.write(f"{offset:010d} 00000 n \n".encode('ascii'))
+        f.write((f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+                 f"startxref\n{xref_offset}\n%%EOF\n").encode('ascii'))
@@ -2,112 +2,112 @@
 """Office変換モジュール"""
 
 import logging
-import docx
-import openpyxl
-import pandas as pd
-from pptx import Presentation
-from pptx.enum.shapes import MSO_SHAPE_TYPE
-from markitdown import MarkItDown
-from typing import Tuple, Optional
+import re
+import threading
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Tuple, Optional
 
+if TYPE_CHECKING:
+    from markitdown import MarkItDown
 
-def analyze_docx(file_path) -> Tuple[int, int]:
+# 本文が参照する画像の関係定義ファイル（拡張子別の接頭辞）
+# ZIP内のメディアにはスライドマスター・レイアウト・ノートやヘッダー・フッターの画像も
+# 含まれるため、本文（文書本体・スライド・シートの図形）の .rels が参照する画像だけを数える
+_BODY_RELS_PREFIXES = {
+    '.docx': 'word/_rels/document.xml.rels',
+    '.pptx': 'ppt/slides/_rels/slide',
+    '.xlsx': 'xl/drawings/_rels/drawing',
+}
+_IMAGE_REL_RE = re.compile(rb'Type=["\'][^"\']*/relationships/image["\']')
+# グラフ定義XML（MarkItDownの出力に現れないため、視覚要素としてZIP内のエントリ数を数える）
+_CHART_PREFIXES = {
+    '.xlsx': 'xl/charts/chart',
+}
+_TEXT_PART_PREFIXES = {
+    '.docx': 'word/document.xml',
+    '.pptx': 'ppt/slides/slide',
+    '.xlsx': 'xl/sharedStrings.xml',
+}
+
+# MarkItDownが出力する画像参照（例: ![alt](Picture1.jpg)）
+_IMAGE_REF_RE = re.compile(r'!\[[^\]]*\]\([^)]*\)')
+
+# MarkItDownインスタンス（コンバーター登録のコストを避けるため再利用する）
+# 並列変換時に同じインスタンスを共有しないよう、スレッドごとに1つ生成する
+_markitdown_local = threading.local()
+
+
+def _get_markitdown() -> "MarkItDown":
     """
-    Wordファイルの視覚要素と文字数を分析する
+    呼び出しスレッド用のMarkItDownインスタンスを返す（初回のみ生成）
     
-    Args:
-        file_path: 対象ファイルのパス
-        
-    Returns:
-        (visual_count, char_count): 視覚要素数と文字数のタプル
+    markitdown はExcel変換のためにpandasを読み込み、インポートだけで数百msかかるため、
+    実際に変換するまでインポートしない。
     """
-    logger = logging.getLogger("notebooklm_loader")
-    try:
-        doc = docx.Document(file_path)
-        visual_count = 0
-        char_count = 0
-        for para in doc.paragraphs:
-            text = para.text.strip()
-            char_count += len(text)
-            for run in para.runs:
-                if run.element.xpath('.//a:blip'):
-                     visual_count += 1
-        return visual_count, char_count
-    except Exception as e:
-        logger.debug(f"analyze_docx error for {file_path}: {e}")
-        return 0, 0
+    md = getattr(_markitdown_local, "instance", None)
+    if md is None:
+        from markitdown import MarkItDown
+        md = MarkItDown()
+        _markitdown_local.instance = md
+    return md
 
 
-def analyze_xlsx(file_path) -> Tuple[int, int]:
+def estimate_office_density(file_path) -> Tuple[int, int]:
     """
-    Excelファイルの視覚要素と文字数を分析する
+    ZIPの中央ディレクトリと本文の関係定義だけを見て視覚要素と文字数を概算する
+    
+    本文の .rels が参照する画像とグラフ（Excelのみ）の数を視覚要素数とし、
+    本文XMLの展開後サイズから文字数を見積もる。展開するのは小さな .rels だけで、
+    本文XMLは展開・パースしないため非常に高速。
     
     Args:
-        file_path: 対象ファイルのパス
+        file_path: 対象ファイルのパス（.docx, .pptx, .xlsx）
         
     Returns:
-        (visual_count, char_count): 視覚要素数と文字数のタプル
+        (visual_count, char_count): 視覚要素数と推定文字数のタプル
     """
     logger = logging.getLogger("notebooklm_loader")
+    ext = Path(file_path).suffix.lower()
+    rels_prefix = _BODY_RELS_PREFIXES.get(ext)
+    text_prefix = _TEXT_PART_PREFIXES.get(ext)
+    chart_prefix = _CHART_PREFIXES.get(ext)
+    if rels_prefix is None:
+        return 0, 0
     try:
         visual_count = 0
-        char_count = 0
-        try:
-            wb_obj = openpyxl.load_workbook(file_path, data_only=True)
-            for sheet_name in wb_obj.sheetnames:
-                sheet = wb_obj[sheet_name]
-                if hasattr(sheet, '_charts') and sheet._charts:
-                    visual_count += len(sheet._charts)
-        except Exception as e:
-            logger.debug(f"analyze_xlsx chart detection error: {e}")
-        wb = openpyxl.load_workbook(file_path, data_only=True)
-        for sheet_name in wb.sheetnames:
-            try:
-                df = pd.read_excel(file_path, sheet_name=sheet_name)
-                if not df.empty:
-                    csv_text = df.to_csv(index=False)
-                    char_count += len(csv_text)
-            except Exception as e:
-                logger.debug(f"analyze_xlsx sheet {sheet_name} error: {e}")
-        return visual_count, char_count
+        xml_size = 0
+        with zipfile.ZipFile(file_path) as z:
+            for info in z.infolist():
+                name = info.filename
+                if name.startswith(rels_prefix) and name.endswith('.rels'):
+                    visual_count += len(_IMAGE_REL_RE.findall(z.read(info)))
+                elif chart_prefix and name.startswith(chart_prefix) and name.endswith('.xml'):
+                    visual_count += 1
+                elif name.startswith(text_prefix) and name.endswith('.xml'):
+                    xml_size += info.file_size
+        # XMLタグのオーバーヘッドを考慮した概算（本文はXMLサイズの約1/3）
+        return visual_count, xml_size // 3
     except Exception as e:
-        logger.debug(f"analyze_xlsx error for {file_path}: {e}")
+        logger.debug(f"estimate_office_density error for {file_path}: {e}")
         return 0, 0
 
 
-def analyze_pptx(file_path) -> Tuple[int, int]:
+def analyze_markdown(markdown_content: str) -> Tuple[int, int]:
     """
-    PowerPointファイルの視覚要素と文字数を分析する
+    MarkItDownの変換結果から視覚要素と文字数を分析する
+    
+    MarkItDownは埋め込み画像をMarkdownの画像参照として出力するため、
+    変換結果だけで視覚密度を判定でき、元ファイルを再パースせずに済む。
     
     Args:
-        file_path: 対象ファイルのパス
+        markdown_content: MarkItDownの変換結果
         
     Returns:
         (visual_count, char_count): 視覚要素数と文字数のタプル
     """
-    logger = logging.getLogger("notebooklm_loader")
-    try:
-        prs = Presentation(file_path)
-        visual_count = 0
-        char_count = 0
-        for slide in prs.slides:
-            if slide.shapes.title:
-                char_count += len(slide.shapes.title.text.strip())
-            for shape in slide.shapes:
-                if shape == slide.shapes.title:
-                    continue
-                if shape.has_text_frame:
-                    char_count += len(shape.text_frame.text.strip())
-                is_visual = False
-                if shape.shape_type == MSO_SHAPE_TYPE.PICTURE: is_visual = True
-                elif shape.shape_type == MSO_SHAPE_TYPE.GROUP: is_visual = True
-                elif shape.shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
-                     if not shape.has_text_frame or not shape.text_frame.text.strip(): is_visual = True
-                if is_visual: visual_count += 1
-        return visual_count, char_count
-    except Exception as e:
-        logger.debug(f"analyze_pptx error for {file_path}: {e}")
-        return 0, 0
+    text, visual_count = _IMAGE_REF_RE.subn('', markdown_content)
+    return visual_count, len(text.strip())
 
 
 def convert_with_markitdown(file_path, max_retries: int = 3) -> Optional[str]:
@@ -127,8 +127,7 @@ def convert_with_markitdown(file_path, max_retries: int = 3) -> Optional[str]:
     last_error = None
     for attempt in range(max_retries):
         try:
-            md = MarkItDown()
-            result = md.convert(str(file_path)) 
+            result = _get_markitdown().convert(str(file_path))
             if result and result.text_content:
                 return result.text_content
             return ""
@@ -1,63 +1,137 @@
 # notebooklm_loader/converters/pdf_converter.py
 """PDF変換モジュール"""
 
+import atexit
 import os
+import shutil
 import subprocess
+import tempfile
+import threading
 import time
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
+# スレッドごとのLibreOfficeユーザープロファイル
+_profiles = threading.local()
+_profile_root: Optional[str] = None
+_profile_lock = threading.Lock()
 
-def convert_to_pdf_via_libreoffice(input_path: Path, output_dir_path: Path, max_retries: int = 3) -> Optional[Path]:
+# 起動時の復元確認・スタートセンター・ロック確認を省いて起動を速くするオプション
+SOFFICE_STARTUP_FLAGS = ["--headless", "--norestore", "--nologo", "--nodefault", "--nolockcheck",
+                         "--nofirststartwizard"]
+
+
+def _thread_profile_uri() -> str:
     """
-    LibreOffice (soffice) を使用してPDF変換を行う
+    呼び出しスレッド専用のLibreOfficeユーザープロファイル（file URI）を返す
+    
+    同じプロファイルを使う soffice は同時に1つしか起動できないため、
+    並列変換時はスレッドごとに別のプロファイルを割り当てる。
+    プロファイルは一時ディレクトリに作成し、終了時に削除する。
+    """
+    global _profile_root
+    uri = getattr(_profiles, "uri", None)
+    if uri is None:
+        with _profile_lock:
+            if _profile_root is None:
+                _profile_root = tempfile.mkdtemp(prefix="notebooklm_lo_")
+                atexit.register(shutil.rmtree, _profile_root, True)
+        uri = Path(_profile_root, f"profile_{threading.get_ident()}").as_uri()
+        _profiles.uri = uri
+    return uri
+
+
+@lru_cache(maxsize=None)
+def _find_soffice() -> str:
+    """sofficeの実行パスを返す（結果はプロセス内でキャッシュする）"""
+    soffice_path = "/Applications/LibreOffice.app/Contents/MacOS/soffice"
+    if not os.path.exists(soffice_path):
+        soffice_path = "soffice"  # Try PATH
+    return soffice_path
+
+
+def convert_batch_via_libreoffice(input_paths: List[Path], output_dir_path: Path, max_retries: int = 3,
+                                  isolated_profile: bool = False,
+                                  display_names: Optional[List[str]] = None) -> List[Optional[Path]]:
+    """
+    LibreOffice (soffice) を1回だけ起動して複数ファイルをまとめてPDF変換する
+    
+    sofficeの起動には1ファイルあたり数秒かかるため、入力をまとめて渡して
+    起動コストを1回分にする。出力PDFは入力のstemで生成されるため、
+    入力ファイルのstemは重複しないようにしておくこと。
+    PDFが生成されなかったファイルだけを対象にリトライする。
     
     Args:
-        input_path: 入力ファイルのパス
+        input_paths: 入力ファイルのパスのリスト
         output_dir_path: 出力ディレクトリ
         max_retries: 最大リトライ回数（デフォルト: 3）
+        isolated_profile: スレッド専用のユーザープロファイルを使うか（並列変換用）
+        display_names: ログに表示する入力ごとの名前（入力を別名で渡す場合の元のファイル名。省略時は入力のファイル名）
         
     Returns:
-        生成されたPDFファイルのパス、失敗時はNone
+        入力ごとの生成PDFパス（入力と同じ順序、失敗したものはNone）
     """
     logger = logging.getLogger("notebooklm_loader")
+    soffice_path = _find_soffice()
     
-    # sofficeパスを検索
-    soffice_path = "/Applications/LibreOffice.app/Contents/MacOS/soffice"
-    if not os.path.exists(soffice_path):
-        soffice_path = "soffice"  # Try PATH
-
-    cmd = [
-        soffice_path,
-        "--headless",
-        "--convert-to", "pdf",
-        "--outdir", str(output_dir_path),
-        str(input_path)
-    ]
-    
-    last_error = None
+    results: List[Optional[Path]] = [None] * len(input_paths)
+    remaining = list(range(len(input_paths)))
+    last_error: Optional[Exception] = None
     for attempt in range(max_retries):
+        cmd = [soffice_path]
+        if isolated_profile:
+            cmd.append(f"-env:UserInstallation={_thread_profile_uri()}")
+        cmd += SOFFICE_STARTUP_FLAGS
+        cmd += [
+            "--convert-to", "pdf",
+            "--outdir", str(output_dir_path),
+        ]
+        cmd += [str(input_paths[i]) for i in remaining]
+        
         try:
             subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            
-            # 出力ファイル確認
-            original_stem = input_path.stem
-            generated_pdf = output_dir_path / (original_stem + ".pdf")
-            if generated_pdf.exists():
-                return generated_pdf
-            
-            # ファイルが見つからない場合もリトライ
-            raise FileNotFoundError(f"Generated PDF not found: {generated_pdf}")
-            
         except Exception as e:
             last_error = e
-            if attempt < max_retries - 1:
-                wait_time = 2 ** attempt  # 指数バックオフ: 1, 2, 4秒
-                logger.debug(f"Retry {attempt + 1}/{max_retries} PDF conversion for {input_path.name} after {wait_time}s: {e}")
-                time.sleep(wait_time)
+        
+        # 出力ファイル確認（見つからないものだけ次回リトライ）
+        failed = []
+        for i in remaining:
+            generated_pdf = output_dir_path / (input_paths[i].stem + ".pdf")
+            if generated_pdf.exists():
+                results[i] = generated_pdf
             else:
-                logger.warning(f"    [PDF Convert Error] {input_path.name} after {max_retries} attempts: {e}")
+                failed.append(i)
+                if last_error is None:
+                    last_error = FileNotFoundError(f"Generated PDF not found: {generated_pdf}")
+        remaining = failed
+        if not remaining:
+            break
+        
+        if attempt < max_retries - 1:
+            wait_time = 2 ** attempt  # 指数バックオフ: 1, 2, 4秒
+            logger.debug(f"Retry {attempt + 1}/{max_retries} PDF conversion for {len(remaining)} file(s) after {wait_time}s: {last_error}")
+            time.sleep(wait_time)
     
-    return None
+    for i in remaining:
+        name = display_names[i] if display_names else input_paths[i].name
+        logger.warning(f"    [PDF Convert Error] {name} after {max_retries} attempts: {last_error}")
+    return results
+
 
+def convert_to_pdf_via_libreoffice(input_path: Path, output_dir_path: Path, max_retries: int = 3,
+                                   isolated_profile: bool = False) -> Optional[Path]:
+    """
+    LibreOffice (soffice) を使用してPDF変換を行う
+    
+    Args:
+        input_path: 入力ファイルのパス
+        output_dir_path: 出力ディレクトリ
+        max_retries: 最大リトライ回数（デフォルト: 3）
+        isolated_profile: スレッド専用のユーザープロファイルを使うか（並列変換用）
+        
+    Returns:
+        生成されたPDFファイルのパス、失敗時はNone
+    """
+    return convert_batch_via_libreoffice([input_path], output_dir_path, max_retries, isolated_profile)[0]
@@ -1,10 +1,10 @@
 # notebooklm_loader/extractors/archive_extractor.py
 """その他の圧縮形式展開モジュール"""
 
+import contextlib
 import os
 import sys
 import tarfile
-from pathlib import Path
 
 # オプショナルライブラリ
 try:
@@ -25,6 +25,18 @@ try:
 except ImportError:
     HAS_LZH = False
 
+try:
+    from isal import igzip_threaded
+    HAS_ISAL = True
+except ImportError:
+    HAS_ISAL = False
+
+# tar展開時の読み込み・コピーバッファサイズ（4MB）
+TAR_BUFFER_SIZE = 4 << 20
+
+# gzipファイルの先頭2バイト
+GZIP_MAGIC = b'\x1f\x8b'
+
 
 def extract_7z(archive_path, extract_to) -> str:
     """
@@ -95,11 +107,15 @@ def extract_tar(archive_path, extract_to) -> str:
         処理結果（"OK", "ERROR"）
     """
     try:
-        with tarfile.open(archive_path, 'r:*') as tf:
-            # ディレクトリトラバーサル対策
-            for member in tf.getmembers():
-                member_path = os.path.join(extract_to, member.name)
-                if not os.path.abspath(member_path).startswith(os.path.abspath(extract_to)):
+        with contextlib.ExitStack() as stack:
+            tf = _open_tar(archive_path, stack)
+            # ディレクトリトラバーサル対策の基準（展開先の絶対パス + 区切り文字）
+            safe_root = os.path.join(os.path.abspath(extract_to), '')
+            # メンバー一覧を先に作らず、読みながら順に展開する
+            for member in tf:
+                # ディレクトリトラバーサル対策
+                member_path = os.path.abspath(os.path.join(safe_root, member.name))
+                if not member_path.startswith(safe_root):
                     continue
                 # Python 3.12+ではfilter引数が必要
                 if sys.version_info >= (3, 12):
@@ -112,6 +128,31 @@ def extract_tar(archive_path, extract_to) -> str:
         return "ERROR"
 
 
+def _open_tar(archive_path, stack: contextlib.ExitStack) -> tarfile.TarFile:
+    """
+    tarファイルを読み込み用に開く
+
+    gzip圧縮でisalが使える場合は、isalで別スレッドで伸長しながら
+    ストリームモード（r|）で読む（標準のgzipモジュールより伸長が速い）。
+    それ以外は標準のtarfileで圧縮形式を自動判定して開く。
+    読み込み・展開とも4MB単位で行う（tarfile既定の16KBではコピー回数が多い）。
+
+    Args:
+        archive_path: 圧縮ファイルのパス
+        stack: 開いたファイルを登録するExitStack
+
+    Returns:
+        TarFile インスタンス
+    """
+    raw = stack.enter_context(open(archive_path, 'rb', buffering=TAR_BUFFER_SIZE))
+    if HAS_ISAL and raw.peek(len(GZIP_MAGIC))[:len(GZIP_MAGIC)] == GZIP_MAGIC:
+        stream = stack.enter_context(igzip_threaded.open(raw, 'rb', threads=1))
+        return stack.enter_context(
+            tarfile.open(fileobj=stream, mode='r|', copybufsize=TAR_BUFFER_SIZE))
+    return stack.enter_context(
+        tarfile.open(fileobj=raw, mode='r:*', copybufsize=TAR_BUFFER_SIZE))
+
+
 def extract_lzh(archive_path, extract_to) -> str:
     """
     LZHファイルを展開
@@ -127,13 +168,15 @@ def extract_lzh(archive_path, extract_to) -> str:
         print(f"    [Warning] lhafile not installed, skipping: {archive_path.name}")
         return "LIBRARY_MISSING"
     try:
+        # ディレクトリトラバーサル対策の基準（展開先の絶対パス + 区切り文字）
+        safe_root = os.path.join(os.path.abspath(extract_to), '')
         with lhafile.LhaFile(str(archive_path)) as lf:
             for info in lf.infolist():
-                target_path = Path(extract_to) / info.filename
+                target_path = os.path.abspath(os.path.join(safe_root, info.filename))
                 # ディレクトリトラバーサル対策
-                if not os.path.abspath(target_path).startswith(os.path.abspath(extract_to)):
+                if not target_path.startswith(safe_root):
                     continue
-                target_path.parent.mkdir(parents=True, exist_ok=True)
+                os.makedirs(os.path.dirname(target_path), exist_ok=True)
                 with open(target_path, 'wb') as f:
                     f.write(lf.read(info.filename))
         return "OK"
@@ -1,11 +1,18 @@
 # notebooklm_loader/extractors/zip_extractor.py
 """ZIP展開モジュール"""
 
+import codecs
 import zipfile
 import shutil
-from pathlib import Path
 import os
 
+# 展開時のコピーバッファサイズ（4MB）
+COPY_BUFFER_SIZE = 4 << 20
+
+# ファイル名の補正に使うコーデック（エントリごとのコーデック検索を省く）
+_CP437_ENCODE = codecs.lookup('cp437').encode
+_CP932_DECODE = codecs.lookup('cp932').decode
+
 
 def extract_zip_with_encoding(zip_path, extract_to) -> str:
     """
@@ -26,6 +33,8 @@ def extract_zip_with_encoding(zip_path, extract_to) -> str:
                 if file_info.flag_bits & 0x1:  # 暗号化フラグ
                     return "PASSWORD_PROTECTED"
             
+            # ディレクトリトラバーサル対策の基準（展開先の絶対パス + 区切り文字）
+            safe_root = os.path.join(os.path.abspath(extract_to), '')
             for file_info in z.infolist():
                 filename = file_info.filename
                 
@@ -33,23 +42,23 @@ def extract_zip_with_encoding(zip_path, extract_to) -> str:
                 if file_info.flag_bits & 0x800 == 0:
                     try:
                         # Windows (Japanese) ZIP is often CP932 encoded but marked as CP437
-                        filename = filename.encode('cp437').decode('cp932')
+                        filename = _CP932_DECODE(_CP437_ENCODE(filename)[0])[0]
                     except (UnicodeDecodeError, UnicodeEncodeError):
                         pass  # エンコーディング変換失敗は元のファイル名を使用
                 
                 # ターゲットパスの生成
-                target_path = Path(extract_to) / filename
+                target_path = os.path.abspath(os.path.join(safe_root, filename))
                 
                 # ディレクトリトラバーサル対策
-                if not os.path.abspath(target_path).startswith(os.path.abspath(extract_to)):
+                if not target_path.startswith(safe_root):
                     continue
                     
                 if file_info.is_dir():
-                    target_path.mkdir(parents=True, exist_ok=True)
+                    os.makedirs(target_path, exist_ok=True)
                 else:
-                    target_path.parent.mkdir(parents=True, exist_ok=True)
+                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
                     with z.open(file_info) as source, open(target_path, "wb") as target:
-                        shutil.copyfileobj(source, target)
+                        shutil.copyfileobj(source, target, COPY_BUFFER_SIZE)
         return "OK"
     except RuntimeError as e:
         if "password" in str(e).lower() or "encrypted" in str(e).lower():
@@ -2,17 +2,22 @@
 """ログ機構モジュール"""
 
 import logging
+import logging.handlers
 import datetime
 from pathlib import Path
 
+# ログファイルへの書き込みをまとめる件数（WARNING以上は即時に書き出す）
+LOG_BUFFER_CAPACITY = 512
 
-def setup_logging(output_dir: Path, verbose: bool = False) -> logging.Logger:
+
+def setup_logging(output_dir: Path, verbose: bool = False, quiet: bool = False) -> logging.Logger:
     """
     ログ機構をセットアップする
     
     Args:
         output_dir: 出力ディレクトリ（ログファイル出力先）
         verbose: 詳細ログ出力フラグ
+        quiet: コンソールにはCRITICALのみ出力する（ログファイルには通常どおり出力）
         
     Returns:
         設定済みのロガー
@@ -31,19 +36,30 @@ def setup_logging(output_dir: Path, verbose: bool = False) -> logging.Logger:
     logger = logging.getLogger("notebooklm_loader")
     logger.setLevel(log_level)
     
-    # 既存ハンドラをクリア
+    # 既存ハンドラをクリア（バッファ済みのログは書き出してから閉じる）
+    for handler in logger.handlers:
+        target = getattr(handler, 'target', None)
+        handler.close()
+        if target is not None:
+            target.close()
     logger.handlers.clear()
     
     # ファイルハンドラ
+    # 1ファイルごとに数件のログを出すため、書き込みは LOG_BUFFER_CAPACITY 件ずつまとめる
+    # （終了時は logging.shutdown で残りが書き出される）
     file_handler = logging.FileHandler(log_file, encoding='utf-8')
     file_handler.setLevel(logging.DEBUG)
     file_format = logging.Formatter('%(asctime)s | %(levelname)-8s | %(message)s')
     file_handler.setFormatter(file_format)
-    logger.addHandler(file_handler)
+    buffered_handler = logging.handlers.MemoryHandler(
+        LOG_BUFFER_CAPACITY, flushLevel=logging.WARNING, target=file_handler
+    )
+    buffered_handler.setLevel(logging.DEBUG)
+    logger.addHandler(buffered_handler)
     
     # コンソールハンドラ
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(log_level)
+    console_handler.setLevel(logging.CRITICAL if quiet else log_level)
     console_format = logging.Formatter('%(message)s')
     console_handler.setFormatter(console_format)
     logger.addHandler(console_handler)
@@ -52,6 +68,40 @@ def setup_logging(output_dir: Path, verbose: bool = False) -> logging.Logger:
     return logger
 
 
+def start_worker_log_listener(log_queue) -> logging.handlers.QueueListener:
+    """
+    ワーカープロセスから送られたログをアプリケーションロガーのハンドラで出力する
+    
+    Args:
+        log_queue: ワーカープロセスと共有するキュー
+        
+    Returns:
+        開始済みのリスナー（終了時に stop() を呼ぶ）
+    """
+    listener = logging.handlers.QueueListener(
+        log_queue, *get_logger().handlers, respect_handler_level=True
+    )
+    listener.start()
+    return listener
+
+
+def init_worker_logging(log_queue, level: int):
+    """
+    ワーカープロセスのロガーを設定する（ProcessPoolExecutor の initializer）
+    
+    ログはキュー経由でメインプロセスに送り、ファイルとコンソールへの出力は
+    メインプロセスのハンドラに任せる。
+    
+    Args:
+        log_queue: メインプロセスと共有するキュー
+        level: ログレベル
+    """
+    logger = get_logger()
+    logger.setLevel(level)
+    logger.handlers.clear()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
 def get_logger() -> logging.Logger:
     """アプリケーションロガーを取得"""
     return logging.getLogger("notebooklm_loader")
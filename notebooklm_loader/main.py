@@ -2,30 +2,326 @@
 """メイン処理モジュール"""
 
 import os
+import multiprocessing
 import shutil
 import tempfile
-import logging
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Tuple, Optional, Set
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple, Optional, Set
 from tqdm import tqdm
 
 from .config import Config
-from .logger import setup_logging, get_logger
+from .logger import setup_logging, get_logger, init_worker_logging, start_worker_log_listener
 from .summary import ProcessingSummary, FileResult
 from .merger import MergedOutputManager
+from .writer import BackgroundWriter, write_output
+from .scan_cache import SCAN_CACHE_FILE, ScanCache
 from .cli import setup_args
-from .utils import get_output_filename, sanitize_content
+from .utils import fast_copy, link_or_copy, make_output_namer, relative_path_str, sanitize_content
 from .extractors import extract_zip_with_encoding, extract_7z, extract_rar, extract_tar, extract_lzh
 from .converters import (
-    analyze_docx, analyze_xlsx, analyze_pptx, 
-    convert_with_markitdown, convert_image_to_pdf, convert_to_pdf_via_libreoffice
+    analyze_markdown, estimate_office_density,
+    convert_with_markitdown, convert_image_to_pdf, convert_batch_via_libreoffice
 )
-from .processors import is_text_file, is_likely_text_by_mime
+from .processors import is_text_file, is_likely_text_by_mime, read_head
 
 
 # 定数
 OUTPUT_DIR_NAME = "converted_files"
 
+# 走査時に中に入らないディレクトリ名（出力先）
+_SKIP_DIR_NAMES = frozenset({OUTPUT_DIR_NAME, OUTPUT_DIR_NAME + "_merged"})
+
+# 個別出力ファイルの末尾に付ける区切り
+CONTENT_TRAILER = "\n\n---\n\n"
+CONTENT_TRAILER_BYTES = CONTENT_TRAILER.encode('utf-8')
+
+# この数以上の視覚要素を含むOfficeファイルは密度に関係なくPDF化する
+PDF_VISUAL_COUNT = 5
+
+
+# 1回のsoffice起動でまとめてPDF変換するファイル数の上限
+PDF_BATCH_SIZE = 32
+
+# PDFを出力する（既存の出力PDFを再利用しうる）カテゴリ
+_PDF_OUTPUT_CATEGORIES = frozenset({'office_new', 'pdf', 'visio', 'image'})
+
+# 拡張子ごとのアーカイブ展開関数
+_ARCHIVE_EXTRACTORS: Dict[str, Callable[[Path, str], str]] = {
+    '.zip': extract_zip_with_encoding,
+    '.7z': extract_7z,
+    '.rar': extract_rar,
+    '.tar': extract_tar,
+    '.gz': extract_tar,
+    '.tgz': extract_tar,
+    '.lzh': extract_lzh,
+}
+
+
+class _ReportItem(NamedTuple):
+    """視覚密度レポートの1行"""
+    file: str
+    visuals: int
+    chars: int
+    ratio: float
+    status: str = ""
+
+
+@dataclass
+class _PdfRequest:
+    """
+    LibreOfficeによるPDF変換要求（まとめて変換するため後回しにする）
+    
+    Attributes:
+        file_path: 入力ファイルのパス
+        file: 入力ファイル名
+        ext: 拡張子
+        final_pdf_path: 最終出力パス
+        merged_dir: マージ出力ディレクトリ（Noneならマージなし）
+        report_item: 視覚密度レポートの項目（状態は変換結果で決める）。Noneならレポート対象外
+        merge_mode: マージディレクトリへの置き方（link_or_copy のモード）
+    """
+    file_path: Path
+    file: str
+    ext: str
+    final_pdf_path: Path
+    merged_dir: Optional[Path] = None
+    report_item: Optional[_ReportItem] = None
+    merge_mode: str = "hardlink"
+
+
+class _PdfOutput(NamedTuple):
+    """
+    出力PDFの確定（最終出力パスへの置き換えとマージディレクトリへのリンク）
+    
+    Attributes:
+        staged_path: 変換・コピー済みのPDFの一時ファイル（Noneなら既存の出力PDFをそのまま使う）
+        final_pdf_path: 最終出力パス
+        merged_dir: マージ出力ディレクトリ（Noneならマージなし）
+        merge_mode: マージディレクトリへの置き方（link_or_copy のモード）
+        result: 確定後にサマリーに追加する処理結果
+    """
+    staged_path: Optional[Path]
+    final_pdf_path: Path
+    merged_dir: Optional[Path]
+    merge_mode: str
+    result: FileResult
+
+
+@dataclass
+class _FileOutcome:
+    """
+    単一ファイルの処理結果
+    
+    Attributes:
+        results: サマリーに追加する処理結果
+        report_items: 視覚密度レポートに追加する項目
+        merged_content: マージ出力に追加する (ファイル名, エンコード済みのコンテンツの断片, 文字数)
+        pdf_request: LibreOfficeでのPDF変換要求
+        markdown_output: 個別出力ファイルの書き込み要求 (出力先パス, エンコード済みのコンテンツの断片, 処理結果)
+        pdf_output: 出力PDFの確定
+    """
+    results: List[FileResult] = field(default_factory=list)
+    report_items: List[_ReportItem] = field(default_factory=list)
+    merged_content: Optional[Tuple[str, Tuple[bytes, ...], int]] = None
+    pdf_request: Optional[_PdfRequest] = None
+    markdown_output: Optional[Tuple[Path, Tuple[bytes, ...], FileResult]] = None
+    pdf_output: Optional[_PdfOutput] = None
+
+
+class _FileScheduler:
+    """
+    ファイル単位の変換をスレッドプールで実行し、結果を投入順に反映する
+    
+    変換処理はLibreOfficeのサブプロセス待ちやC拡張でのパースが中心でGILを
+    解放するため、スレッドで並列化できる。summary・report_items・mergerへの
+    反映はメインスレッドで投入順に行い、マージ出力の順序を逐次処理と揃える。
+    LibreOfficeでのPDF変換要求は最大 PDF_BATCH_SIZE 件ずつまとめて1回のsoffice起動で変換する。
+    executor が None の場合はその場で実行する（逐次処理）。
+    pdf_executor を指定すると、PDF変換をその実行先で走らせ、走査・解析と重ねて処理する
+    （逐次処理でもsofficeの起動待ちの間に次のファイルを解析できる）。変換中のバッチがなければ
+    要求をすぐに変換し始め、変換中に届いた要求は次のバッチにまとめる。
+    変換中のPDFは未反映の処理数（max_pending）に数えず、summary・report_items での位置だけを
+    確保しておき、後続の結果はその位置より後に反映する。
+    markdown_executor はMarkItDown変換（純Pythonのパースが中心でGILを解放しない）を
+    実行するプロセスプールで、ワーカースレッドから変換を依頼する。
+    scan_cache はファイル判定結果の実行間キャッシュで、各ファイルの処理に渡す。
+    出力PDFの書き出し（再利用）の完了も反映時に scan_cache へ記録する。
+    個別出力ファイルの書き込みと出力PDFの確定もメインスレッドから投入順に行うため、
+    出力名が衝突する場合は逐次処理と同じく後に投入したファイルの出力が残る。
+    writer を指定すると書き込みをそのライタースレッドに任せる（Noneならその場で書き込む）。
+    """
+
+    def __init__(self, executor: Optional[Executor], summary: ProcessingSummary,
+                 report_items: List, merger: Optional[MergedOutputManager], max_pending: int = 16,
+                 pdf_executor: Optional[Executor] = None, markdown_executor: Optional[Executor] = None,
+                 scan_cache: Optional[ScanCache] = None, writer: Optional[BackgroundWriter] = None):
+        self.executor = executor
+        self.pdf_executor = pdf_executor or executor
+        self.markdown_executor = markdown_executor
+        self.scan_cache = scan_cache
+        self.writer = writer
+        self.summary = summary
+        self.report_items = report_items
+        self.merger = merger
+        self.max_pending = max_pending
+        self._pending: "deque[Future]" = deque()
+        # summary・report_items への反映待ちの [結果, 個別出力ファイルの書き込みのFuture]（投入順）。
+        # PDF変換中の要求は [None, None] で位置を確保する
+        self._records: "deque[List]" = deque()
+        self._pdf_batch: List[Tuple[_PdfRequest, List]] = []
+        self._pdf_running: "deque[Tuple[Future, List[List]]]" = deque()
+
+    def submit(self, fn: Callable[..., _FileOutcome], *args):
+        """処理を投入する（未反映の結果が多すぎる場合は古いものから反映して待つ）"""
+        if self.executor is None:
+            self._apply(fn(*args))
+        else:
+            self._pending.append(self.executor.submit(fn, *args))
+        # 完了済みの結果を反映し、未反映が多すぎる場合は古いものを待つ
+        while self._pending and (self._pending[0].done() or len(self._pending) > self.max_pending):
+            self._apply(self._pending.popleft().result())
+        self._collect_pdf_batches()
+
+    def add_result(self, result: FileResult):
+        """走査中に確定した処理結果を、投入済みの処理の結果の後に反映する"""
+        outcome = _FileOutcome(results=[result])
+        if self._pending:
+            future: Future = Future()
+            future.set_result(outcome)
+            self._pending.append(future)
+        else:
+            self._apply(outcome)
+
+    def drain(self):
+        """投入済みの処理（保留中のPDF変換・書き込みを含む）をすべて完了させて反映する"""
+        while self._pending or self._pdf_batch or self._pdf_running or self._records:
+            if self._pending:
+                self._apply(self._pending.popleft().result())
+            elif self._pdf_running:
+                self._collect_pdf_batches(wait=True)
+            elif self._pdf_batch:
+                self._flush_pdf_batch()
+            else:
+                # 残りは書き込み待ちの結果のみ
+                self._records[0][1].result()
+                self._flush_records()
+
+    def _flush_pdf_batch(self):
+        """保留中のPDF変換要求をまとめて変換する"""
+        batch, self._pdf_batch = self._pdf_batch, []
+        requests = [request for request, _ in batch]
+        slots = [slot for _, slot in batch]
+        if self.pdf_executor is None:
+            self._fill_pdf_slots(slots, _convert_pdf_batch(requests, False))
+        else:
+            # 複数のsofficeが同時に動く場合のみプロファイルを分ける
+            isolated_profile = self.executor is not None
+            future = self.pdf_executor.submit(_convert_pdf_batch, requests, isolated_profile)
+            self._pdf_running.append((future, slots))
+
+    def _collect_pdf_batches(self, wait: bool = False):
+        """完了したPDF変換の結果を反映する（wait=True なら最も古い変換の完了を待つ）"""
+        while self._pdf_running and (wait or self._pdf_running[0][0].done()):
+            future, slots = self._pdf_running.popleft()
+            self._fill_pdf_slots(slots, future.result())
+            wait = False
+        # 変換中のバッチがなくなったら、その間に届いた要求の変換を始める
+        if self._pdf_batch and self.pdf_executor is not None and not self._pdf_running:
+            self._flush_pdf_batch()
+
+    def _fill_pdf_slots(self, slots: List[List], outcomes: List[_FileOutcome]):
+        """PDF変換の結果を確保しておいた位置に入れ、反映できる結果を反映する"""
+        for slot, outcome in zip(slots, outcomes):
+            slot[0] = outcome
+        self._flush_records()
+
+    def _apply(self, outcome: _FileOutcome):
+        """処理結果をメインスレッドで反映する"""
+        if self.merger and outcome.merged_content:
+            self.merger.add_encoded(*outcome.merged_content)
+        self._records.append([outcome, self._write(outcome.markdown_output)])
+        # 反映待ちの間に本文を保持し続けないよう、使い終えたコンテンツは手放す
+        outcome.merged_content = None
+        outcome.markdown_output = None
+        if outcome.pdf_request:
+            slot: List = [None, None]
+            self._records.append(slot)
+            self._pdf_batch.append((outcome.pdf_request, slot))
+            if len(self._pdf_batch) >= PDF_BATCH_SIZE or (self.pdf_executor is not None and not self._pdf_running):
+                self._flush_pdf_batch()
+        self._flush_records()
+
+    def _write(self, markdown_output: Optional[Tuple[Path, Tuple[bytes, ...], FileResult]]) -> Optional[Future]:
+        """個別出力ファイルの書き込みを投入順に行う（書き込み後の処理結果のFutureを返す）"""
+        if markdown_output is None:
+            return None
+        if self.writer:
+            return self.writer.submit(*markdown_output)
+        future: Future = Future()
+        future.set_result(write_output(*markdown_output))
+        return future
+
+    def _flush_records(self):
+        """位置と書き込みが確定した結果を summary・report_items に投入順に反映する"""
+        while self._records and self._records[0][0] is not None and \
+                (self._records[0][1] is None or self._records[0][1].done()):
+            outcome, written = self._records.popleft()
+            results = list(outcome.results)
+            if outcome.pdf_output:
+                pdf_result = _finalize_pdf(outcome.pdf_output)
+                if pdf_result:
+                    results.append(pdf_result)
+            if written:
+                results.append(written.result())
+            for result in results:
+                self.summary.add_result(result)
+                if self.scan_cache and result.output:
+                    self.scan_cache.record_output(result.output)
+            self.report_items.extend(outcome.report_items)
+
+
+class _ArchivePrefetcher:
+    """
+    ディレクトリ内のアーカイブを処理順に先行して展開する
+    
+    展開（zlib/lzma等の伸張）はGILを解放するため、ファイル変換用のスレッドプールで
+    複数のアーカイブを並列に展開しておき、走査がそのアーカイブに到達した時点で
+    展開済みの一時ディレクトリを受け取る。ディスク使用量を抑えるため、
+    先行して展開するのは max_ahead 件まで。
+    """
+
+    def __init__(self, executor: Optional[Executor], archives: List[Tuple[Path, str]], max_ahead: int):
+        self.executor = executor
+        self.max_ahead = max_ahead
+        self._queue: "deque[Tuple[Path, str]]" = deque(archives if executor else [])
+        self._futures: Dict[Path, Future] = {}
+        self._fill()
+
+    def _fill(self):
+        while self._queue and len(self._futures) < self.max_ahead:
+            archive_path, ext = self._queue.popleft()
+            self._futures[archive_path] = self.executor.submit(_extract_to_temp, archive_path, ext)
+
+    def take(self, archive_path: Path) -> Optional[Future]:
+        """先行展開の結果を受け取る（先行展開していなければNone）"""
+        future = self._futures.pop(archive_path, None)
+        self._fill()
+        return future
+
+    def close(self):
+        """受け取られなかった展開結果の一時ディレクトリを削除する"""
+        self._queue.clear()
+        for future in self._futures.values():
+            try:
+                _, temp_dir = future.result()
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            except Exception:
+                pass
+        self._futures.clear()
 
 
 def process_directory(
@@ -38,7 +334,9 @@ def process_directory(
     summary: ProcessingSummary,
     processed_archives: Optional[Set] = None,
     password_protected_files: Optional[List] = None,
-    show_progress: bool = True
+    show_progress: bool = True,
+    writer: Optional[BackgroundWriter] = None,
+    scheduler: Optional[_FileScheduler] = None
 ) -> List[str]:
     """
     ディレクトリを再帰的に処理する
@@ -53,6 +351,9 @@ def process_directory(
         summary: 処理サマリー
         processed_archives: 処理済みアーカイブセット
         password_protected_files: パスワード保護ファイルリスト
+        show_progress: 進捗バーを表示するか
+        writer: 個別出力ファイルの非同期ライター（scheduler を省略した場合に使う。Noneなら同期書き込み）
+        scheduler: ファイル単位の処理の実行先（Noneなら逐次処理）
         
     Returns:
         パスワード保護ファイルのリスト
@@ -63,46 +364,69 @@ def process_directory(
         processed_archives = set()
     if password_protected_files is None:
         password_protected_files = []
+    if scheduler is None:
+        scheduler = _FileScheduler(None, summary, report_items, merger, writer=writer)
 
     # アーカイブファイルの場合
     if current_path.is_file():
         ext = current_path.suffix.lower()
         if ext in config.archive_extensions:
-            if current_path in processed_archives:
-                return password_protected_files
-            processed_archives.add(current_path)
-            
-            logger.info(f"Extracting Archive [{ext}]: {current_path.name} ...")
-            try:
-                with tempfile.TemporaryDirectory() as temp_dir:
-                    result = _extract_archive(current_path, temp_dir, ext)
-                    
-                    if result == "PASSWORD_PROTECTED":
-                        logger.warning(f"    [!] Password protected: {current_path.name}")
-                        password_protected_files.append(str(current_path))
-                        summary.add_result(FileResult(
-                            path=str(current_path),
-                            status="password_protected",
-                            file_type=ext
-                        ))
-                    elif result == "OK":
-                        process_directory(
-                            Path(temp_dir), Path(temp_dir), output_dir, config,
-                            report_items, merger, summary, processed_archives, password_protected_files,
-                            show_progress=False  # アーカイブ内は進捗表示しない
-                        )
-            except Exception as e:
-                logger.error(f"Error processing archive {current_path}: {e}")
+            _extract_and_recurse(
+                current_path, ext, output_dir, config, report_items, merger, summary,
+                processed_archives, password_protected_files, scheduler,
+                show_progress=False  # アーカイブ内は進捗表示しない
+            )
             return password_protected_files
 
     # ディレクトリ処理 - まずファイル一覧を収集
-    all_files = []
-    for root, dirs, files in os.walk(current_path):
-        if OUTPUT_DIR_NAME in root or "converted_files_merged" in root:
-            continue
-        for file in files:
-            if not file.startswith('.'):
-                all_files.append((root, file))
+    all_files = [entry for entry in _iter_files(str(current_path)) if not entry.name.startswith('.')]
+    
+    # アーカイブは走査より先にスレッドプールで並列に展開しておく
+    archives = []
+    for entry in all_files:
+        ext = os.path.splitext(entry.name)[1].lower()
+        if config.extension_map.get(ext) == 'archive' and not entry.is_symlink():
+            archive_path = Path(entry.path)
+            if archive_path not in processed_archives:
+                archives.append((archive_path, ext))
+    prefetcher = _ArchivePrefetcher(scheduler.executor, archives, max_ahead=config.jobs)
+    try:
+        _process_entries(
+            all_files, root_path, output_dir, config, report_items, merger, summary,
+            processed_archives, password_protected_files, show_progress, scheduler, prefetcher
+        )
+    finally:
+        prefetcher.close()
+    
+    return password_protected_files
+
+
+def _process_entries(
+    all_files: List[os.DirEntry],
+    root_path: Path,
+    output_dir: Path,
+    config: Config,
+    report_items: List,
+    merger: Optional[MergedOutputManager],
+    summary: ProcessingSummary,
+    processed_archives: Set,
+    password_protected_files: List,
+    show_progress: bool,
+    scheduler: _FileScheduler,
+    prefetcher: _ArchivePrefetcher
+):
+    """
+    列挙済みのファイルを順に処理する（process_directory の本体）
+    
+    Args:
+        all_files: 処理対象ファイルのDirEntryリスト
+        prefetcher: アーカイブの先行展開
+        （その他の引数は process_directory と同じ）
+    """
+    logger = get_logger()
+    
+    # 出力ファイル名生成関数（ルートパスを固定）
+    namer = make_output_namer(root_path)
     
     # プログレスバー付きでファイルを処理
     file_iterator = all_files
@@ -110,8 +434,9 @@ def process_directory(
         file_iterator = tqdm(all_files, desc="Processing files", unit="file", 
                             leave=True, dynamic_ncols=True)
     
-    for root, file in file_iterator:
-        file_path = Path(root) / file
+    for entry in file_iterator:
+        file = entry.name
+        file_path = Path(entry.path)
         
         if show_progress and isinstance(file_iterator, tqdm):
             file_iterator.set_postfix_str(file[:30] + '...' if len(file) > 30 else file)
@@ -120,70 +445,391 @@ def process_directory(
         if file.startswith('.'):
             continue
             
-            # シンボリックリンクをスキップ
-            if file_path.is_symlink():
-                logger.debug(f"[Skipped Symlink] {file}")
-                summary.add_result(FileResult(path=str(file_path), status="skipped", file_type="symlink"))
+        # シンボリックリンクをスキップ（DirEntryの種別情報を使うため追加のstatは不要）
+        if entry.is_symlink():
+            logger.debug(f"[Skipped Symlink] {file}")
+            scheduler.add_result(FileResult(path=str(file_path), status="skipped", file_type="symlink"))
+            continue
+        
+        # 注: 巨大ファイルはテキストならmergerで自動分割、バイナリならMIME判定でスキップ
+        
+        ext = os.path.splitext(file)[1].lower()
+        category = config.extension_map.get(ext)
+        
+        # スキップ対象
+        if category == 'skip':
+            logger.debug(f"[Skipped Unsupported] {file}")
+            scheduler.add_result(FileResult(path=str(file_path), status="skipped", file_type=ext))
+            continue
+        
+        # アーカイブファイルの再帰処理
+        if category == 'archive':
+            _extract_and_recurse(
+                file_path, ext, output_dir, config, report_items, merger, summary,
+                processed_archives, password_protected_files, scheduler,
+                extraction=prefetcher.take(file_path)
+            )
+            continue
+
+        # 出力PDF名の使用は走査順に記録する（衝突したファイルの出力を再利用しないため）
+        if scheduler.scan_cache and category in _PDF_OUTPUT_CATEGORIES:
+            scheduler.scan_cache.claim_output(namer(file_path, ".pdf"), file_path)
+
+        # ファイル処理
+        scheduler.submit(
+            _process_single_file,
+            file_path, file, ext, root_path, output_dir, config,
+            merger.output_dir if merger else None, namer, scheduler.markdown_executor,
+            scheduler.scan_cache
+        )
+
+
+def _iter_files(top: str) -> Iterator[os.DirEntry]:
+    """
+    ディレクトリ配下のファイルを os.walk と同じ順序で列挙する
+    
+    os.scandir のDirEntryをそのまま返すため、呼び出し側で種別判定のための
+    stat を追加で発行せずに済む。出力ディレクトリ・隠しディレクトリと
+    シンボリックリンク先のディレクトリには入らない（os.walk と同様、
+    ディレクトリへのリンクは返さない）。除外はディレクトリ名で判定するため、
+    出力ツリー内のファイルは一切列挙しない。
+    
+    Args:
+        top: 起点ディレクトリ
+        
+    Yields:
+        ファイル（およびファイルへのシンボリックリンク）のDirEntry
+    """
+    subdirs = []
+    try:
+        with os.scandir(top) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    yield entry
+                elif not (entry.name in _SKIP_DIR_NAMES or entry.name.startswith('.') or entry.is_symlink()):
+                    subdirs.append(entry.path)
+    except OSError:
+        return
+    for subdir in subdirs:
+        yield from _iter_files(subdir)
+
+
+def _extract_and_recurse(
+    archive_path: Path,
+    ext: str,
+    output_dir: Path,
+    config: Config,
+    report_items: List,
+    merger: Optional[MergedOutputManager],
+    summary: ProcessingSummary,
+    processed_archives: Set,
+    password_protected_files: List,
+    scheduler: _FileScheduler,
+    show_progress: bool = True,
+    extraction: Optional[Future] = None
+):
+    """
+    アーカイブを一時ディレクトリに展開し、展開先を再帰的に処理する
+    
+    処理済みのアーカイブは再展開しない。パスワード保護されている場合は
+    password_protected_files とサマリーに記録する。
+    
+    Args:
+        archive_path: アーカイブのパス
+        ext: 拡張子
+        show_progress: 展開先の処理で進捗バーを表示するか
+        extraction: 先行展開の結果（_extract_to_temp のFuture。Noneならここで展開する）
+        （その他の引数は process_directory と同じ）
+    """
+    logger = get_logger()
+    if archive_path in processed_archives:
+        return
+    processed_archives.add(archive_path)
+    
+    logger.info(f"Extracting Archive [{ext}]: {archive_path.name} ...")
+    try:
+        if extraction is None:
+            result, temp_dir = _extract_to_temp(archive_path, ext)
+        else:
+            result, temp_dir = extraction.result()
+        try:
+            if result == "PASSWORD_PROTECTED":
+                logger.warning(f"    [!] Password protected: {archive_path.name}")
+                password_protected_files.append(str(archive_path))
+                scheduler.add_result(FileResult(
+                    path=str(archive_path),
+                    status="password_protected",
+                    file_type=ext
+                ))
+            elif result == "OK":
+                process_directory(
+                    Path(temp_dir), Path(temp_dir), output_dir, config,
+                    report_items, merger, summary, processed_archives, password_protected_files,
+                    show_progress=show_progress, scheduler=scheduler
+                )
+                # 一時ディレクトリが削除される前に展開ファイルの処理を終える
+                scheduler.drain()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    except Exception as e:
+        logger.error(f"Error processing archive {archive_path}: {e}")
+
+
+def _extract_to_temp(archive_path: Path, ext: str) -> Tuple[str, str]:
+    """
+    アーカイブを新しい一時ディレクトリに展開する
+    
+    先行展開ではワーカースレッドから呼ばれる。一時ディレクトリの削除は呼び出し側で行う。
+    
+    Returns:
+        (展開結果, 一時ディレクトリ)
+    """
+    temp_dir = tempfile.mkdtemp()
+    try:
+        extractor = _ARCHIVE_EXTRACTORS.get(ext)
+        result = extractor(archive_path, temp_dir) if extractor else "UNSUPPORTED"
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    return result, temp_dir
+
+
+def _staging_path(final_pdf_path: Path) -> Path:
+    """
+    出力PDFを確定前に置く一時ファイルを、最終出力パスと同じディレクトリに作る
+    
+    出力名が衝突するファイル同士でも別のファイルになる。
+    """
+    fd, staged = tempfile.mkstemp(prefix=f".{final_pdf_path.name}.", suffix=".tmp", dir=final_pdf_path.parent)
+    os.close(fd)
+    return Path(staged)
+
+
+def _discard(staged_path: Path):
+    """確定しなかった一時ファイルを削除する"""
+    try:
+        os.unlink(staged_path)
+    except OSError:
+        pass
+
+
+def _convert_to_staged_pdf(convert: Callable[..., Optional[Path]], file_path: Path,
+                           final_pdf_path: Path, **kwargs) -> Optional[Path]:
+    """
+    作業用の一時ディレクトリでPDF変換を行い、確定前の一時ファイルへ移動する
+    
+    変換器は入力ファイル名（stem）でPDFを出力するため、並列変換時に
+    同名ファイル同士や既存の出力PDFと衝突しないよう個別のディレクトリを使う。
+    
+    Args:
+        convert: PDF変換関数（入力パス, 出力ディレクトリ）
+        file_path: 入力ファイルのパス
+        final_pdf_path: 最終出力パス
+    
+    Returns:
+        一時ファイルのパス、変換失敗時はNone
+    """
+    with tempfile.TemporaryDirectory(dir=final_pdf_path.parent) as work_dir:
+        pdf_result = convert(file_path, Path(work_dir), **kwargs)
+        if not pdf_result:
+            return None
+        staged_path = _staging_path(final_pdf_path)
+        try:
+            os.replace(pdf_result, staged_path)
+        except BaseException:
+            _discard(staged_path)
+            raise
+    return staged_path
+
+
+def _finalize_pdf(output: _PdfOutput) -> Optional[FileResult]:
+    """
+    出力PDFを最終出力パスに置き、マージディレクトリにリンクする
+    
+    メインスレッドから投入順に呼ぶ。
+    
+    Returns:
+        処理結果、最終出力パスに置けなかった場合はNone
+    """
+    logger = get_logger()
+    if output.staged_path is not None:
+        try:
+            os.replace(output.staged_path, output.final_pdf_path)
+        except Exception as e:
+            logger.error(f"    Error renaming PDF: {e}")
+            _discard(output.staged_path)
+            return None
+    if output.merged_dir:
+        try:
+            link_or_copy(output.final_pdf_path, output.merged_dir / output.final_pdf_path.name, output.merge_mode)
+        except Exception as e:
+            logger.error(f"Error copying PDF: {e}")
+    return output.result
+
+
+def _record_pdf_staging_error(req: _PdfRequest, outcome: _FileOutcome, error: Exception):
+    """PDF変換の準備（作業用ディレクトリへの配置）に失敗した要求をエラーとして記録する"""
+    get_logger().error(f"    Error preparing PDF conversion for {req.file}: {error}")
+    if req.report_item:
+        outcome.report_items.append(req.report_item._replace(status="Kept Original (PDF Fail)"))
+    outcome.results.append(FileResult(path=str(req.file_path), status="error", error_message=str(error), file_type=req.ext))
+
+
+def _convert_pdf_batch(requests: List[_PdfRequest], isolated_profile: bool) -> List[_FileOutcome]:
+    """
+    PDF変換要求をまとめてLibreOfficeで変換する
+    
+    サブディレクトリ違いの同名ファイルが出力で衝突しないよう、入力は作業用
+    一時ディレクトリに連番のファイル名でリンクしてから変換する。
+    作業用ディレクトリに置けなかった要求はエラーとして記録し、残りの要求だけを変換する。
+    
+    Args:
+        requests: PDF変換要求のリスト
+        isolated_profile: スレッド専用のLibreOfficeプロファイルを使うか
+        
+    Returns:
+        要求ごとの変換結果（requests と同じ順）
+    """
+    logger = get_logger()
+    outcomes = [_FileOutcome() for _ in requests]
+    
+    try:
+        work_context = tempfile.TemporaryDirectory(dir=requests[0].final_pdf_path.parent)
+    except OSError as e:
+        for req, outcome in zip(requests, outcomes):
+            _record_pdf_staging_error(req, outcome, e)
+        return outcomes
+    
+    with work_context as work_dir:
+        work_path = Path(work_dir)
+        staged: List[Tuple[int, Path]] = []
+        for i, req in enumerate(requests):
+            staged_path = work_path / f"{i:04d}{req.file_path.suffix}"
+            try:
+                try:
+                    os.symlink(req.file_path.resolve(), staged_path)
+                except OSError:
+                    fast_copy(req.file_path, staged_path)
+            except Exception as e:
+                _record_pdf_staging_error(req, outcomes[i], e)
                 continue
-            
-            # 注: 巨大ファイルはテキストならmergerで自動分割、バイナリならMIME判定でスキップ
-            
-            ext = file_path.suffix.lower()
-            
-            # スキップ対象
-            if ext in config.skip_extensions:
-                logger.debug(f"[Skipped Unsupported] {file}")
-                summary.add_result(FileResult(path=str(file_path), status="skipped", file_type=ext))
+            staged.append((i, staged_path))
+        if not staged:
+            return outcomes
+        
+        pdf_results = convert_batch_via_libreoffice(
+            [staged_path for _, staged_path in staged], work_path, isolated_profile=isolated_profile,
+            display_names=[requests[i].file for i, _ in staged]
+        )
+        
+        for (i, _), pdf_result in zip(staged, pdf_results):
+            req = requests[i]
+            outcome = outcomes[i]
+            target_pdf_name = req.final_pdf_path.name
+            if not pdf_result:
+                if req.report_item:
+                    logger.warning(f"    [Fallback] PDF conversion failed: {req.file}")
+                    outcome.report_items.append(req.report_item._replace(status="Kept Original (PDF Fail)"))
+                else:
+                    logger.warning(f"    [Warning] Could not convert: {req.file}")
                 continue
-            
-            # アーカイブファイルの再帰処理
-            if ext in config.archive_extensions:
-                if file_path not in processed_archives:
-                    processed_archives.add(file_path)
-                    logger.info(f"Extracting Archive [{ext}]: {file} ...")
-                    try:
-                        with tempfile.TemporaryDirectory() as temp_dir:
-                            result = _extract_archive(file_path, temp_dir, ext)
-                            
-                            if result == "PASSWORD_PROTECTED":
-                                logger.warning(f"    [!] Password protected: {file}")
-                                password_protected_files.append(str(file_path))
-                                summary.add_result(FileResult(
-                                    path=str(file_path),
-                                    status="password_protected",
-                                    file_type=ext
-                                ))
-                            elif result == "OK":
-                                process_directory(
-                                    Path(temp_dir), Path(temp_dir), output_dir, config,
-                                    report_items, merger, summary, processed_archives, password_protected_files
-                                )
-                    except Exception as e:
-                        logger.error(f"Error processing archive {file}: {e}")
+            # 最終出力パスへの置き換えは _FileScheduler が投入順に行う
+            staged_pdf = None
+            try:
+                staged_pdf = _staging_path(req.final_pdf_path)
+                os.replace(pdf_result, staged_pdf)
+            except Exception as e:
+                logger.error(f"    Error renaming PDF: {e}")
+                if staged_pdf:
+                    _discard(staged_pdf)
                 continue
-
-            # ファイル処理
-            result = _process_single_file(
-                file_path, file, ext, root_path, output_dir, config, 
-                report_items, merger, summary
+            
+            if req.report_item:
+                outcome.report_items.append(req.report_item._replace(status="Converted to PDF"))
+            logger.info(f"    -> Success: {target_pdf_name}")
+            outcome.pdf_output = _PdfOutput(
+                staged_pdf, req.final_pdf_path, req.merged_dir, req.merge_mode,
+                FileResult(path=str(req.file_path), status="converted", output=target_pdf_name, file_type=req.ext)
             )
     
-    return password_protected_files
+    return outcomes
 
 
-def _extract_archive(archive_path: Path, extract_to: str, ext: str) -> str:
-    """アーカイブを展開"""
-    if ext == '.zip':
-        return extract_zip_with_encoding(archive_path, extract_to)
-    elif ext == '.7z':
-        return extract_7z(archive_path, extract_to)
-    elif ext == '.rar':
-        return extract_rar(archive_path, extract_to)
-    elif ext in ['.tar', '.gz', '.tgz']:
-        return extract_tar(archive_path, extract_to)
-    elif ext == '.lzh':
-        return extract_lzh(archive_path, extract_to)
-    return "UNSUPPORTED"
+def _convert_markdown(file_path: Path, markdown_executor: Optional[Executor]) -> Optional[str]:
+    """
+    MarkItDownでMarkdownに変換する
+    
+    プロセスプールが使えない状態（ワーカーの異常終了など）ならこのスレッドで変換する。
+    """
+    if markdown_executor is not None:
+        try:
+            return markdown_executor.submit(convert_with_markitdown, file_path).result()
+        except BrokenProcessPool as e:
+            get_logger().debug(f"MarkItDown worker unavailable, converting in-process: {e}")
+    return convert_with_markitdown(file_path)
+
+
+def _is_visual_dense(vis_count: int, char_count: int, config: Config) -> bool:
+    """視覚要素が多い（PDF化する）Officeファイルか"""
+    ratio = char_count / vis_count if vis_count > 0 else 9999
+    return ratio < config.visual_density_threshold or vis_count >= PDF_VISUAL_COUNT
+
+
+def _reuse_pdf(file_path: Path, ext: str, final_pdf_path: Path, merged_dir: Optional[Path],
+               config: Config, outcome: _FileOutcome, scan_cache: Optional[ScanCache]) -> bool:
+    """
+    前回の実行で同じ元ファイルから出力したPDFがあれば、変換・コピーせずにそのまま使う
+    
+    元ファイルが変更されていないことを scan_cache の記録（走査時に claim_output 済み）で確かめる。
+    出力名が他のファイルと衝突する場合・アーカイブの展開先のファイル・--full-rebuild 指定時は
+    常に変換し直す。マージディレクトリへのリンクは確定時に作り直す。
+    
+    Returns:
+        再利用した場合True（結果は outcome に記録済み）
+    """
+    if scan_cache is None or config.full_rebuild:
+        return False
+    if not scan_cache.reusable_output(final_pdf_path.name) or not final_pdf_path.is_file():
+        return False
+    target_pdf_name = final_pdf_path.name
+    get_logger().info(f"    -> Up to date: {target_pdf_name}")
+    outcome.pdf_output = _PdfOutput(
+        None, final_pdf_path, merged_dir, config.merge_mode,
+        FileResult(path=str(file_path), status="converted", output=target_pdf_name, file_type=ext)
+    )
+    return True
+
+
+def _detect_text_encoding(file_path: Path, is_known_text: bool) -> Optional[str]:
+    """
+    テキストファイルの文字コードを判定する
+    
+    先頭を1回だけ読み、MIME判定と文字コード判定で使い回す。
+    
+    Args:
+        file_path: 対象ファイルのパス
+        is_known_text: テキストの拡張子か（判定できなくてもUTF-8として読む）
+        
+    Returns:
+        文字コード、バイナリと判定した場合はNone
+    """
+    try:
+        head = read_head(file_path)
+    except OSError:
+        head = None
+    mime_is_text = is_likely_text_by_mime(file_path, head)
+    
+    if is_known_text or mime_is_text == True:
+        _, detected_encoding = is_text_file(file_path, head)
+        return detected_encoding or 'utf-8'
+    if mime_is_text == False:
+        return None
+    is_readable, detected_encoding = is_text_file(file_path, head)
+    return detected_encoding if is_readable else None
 
 
 def _process_single_file(
@@ -193,180 +839,169 @@ def _process_single_file(
     root_path: Path,
     output_dir: Path,
     config: Config,
-    report_items: List,
-    merger: Optional[MergedOutputManager],
-    summary: ProcessingSummary
-) -> bool:
-    """単一ファイルを処理"""
+    merged_dir: Optional[Path],
+    namer: Callable[..., str],
+    markdown_executor: Optional[Executor] = None,
+    scan_cache: Optional[ScanCache] = None
+) -> _FileOutcome:
+    """
+    単一ファイルを処理
+    
+    ワーカースレッドから呼ばれるため、summary・report_items・mergerには直接触れず、
+    結果を _FileOutcome に記録して返す（反映はメインスレッドで行う）。
+    個別出力ファイル・出力PDFも最終出力パスには書かず、書き込み要求・一時ファイルとして返す。
+    MarkItDown変換は markdown_executor（プロセスプール）があればそちらで行う。
+    前回から変更されていないファイルは scan_cache の判定結果（視覚密度・文字コード）を再利用し、
+    前回同じ元ファイルから出力したPDFがあれば変換し直さない。
+    """
     logger = get_logger()
+    outcome = _FileOutcome()
+    category = config.extension_map.get(ext)
     vis_count = 0
     char_count = 0
     markdown_content = ""
+    sanitized = False
 
     # 1. 新形式Office (.docx, .xlsx, .pptx)
-    if ext == '.docx':
-        logger.info(f"Processing: {file}")
-        vis_count, char_count = analyze_docx(file_path)
-    elif ext == '.xlsx':
-        logger.info(f"Processing: {file}")
-        vis_count, char_count = analyze_xlsx(file_path)
-    elif ext == '.pptx':
-        if config.skip_ppt:
+    if category == 'office_new':
+        if ext == '.pptx' and config.skip_ppt:
             logger.info(f"Skipping PPT: {file}")
-            return False
+            return outcome
         logger.info(f"Processing: {file}")
-        vis_count, char_count = analyze_pptx(file_path)
+        cached = scan_cache.get(file_path) if scan_cache else None
+        if cached and 'density' in cached:
+            # 前回の判定結果を再利用し、PDF化するファイルはMarkItDown変換自体を省略する
+            vis_count, char_count = cached['density']
+            needs_markdown = not _is_visual_dense(vis_count, char_count, config)
+        else:
+            # 本文が参照する画像数をZIPから概算し、明らかに画像主体ならMarkItDown変換を省略
+            vis_count, char_count = estimate_office_density(file_path)
+            needs_markdown = vis_count < PDF_VISUAL_COUNT
+        if needs_markdown:
+            # MarkItDownで変換し、その結果から視覚密度を判定する（二重パース回避）
+            # 変換失敗時はZIPからの概算値で判定する
+            markdown_content = _convert_markdown(file_path, markdown_executor)
+            if markdown_content is not None:
+                estimated_visuals = vis_count
+                vis_count, char_count = analyze_markdown(markdown_content)
+                if ext == '.xlsx':
+                    # Excelの変換結果には画像・グラフが現れないため、ZIPから数えた画像・グラフ数で補う
+                    vis_count = max(vis_count, estimated_visuals)
+        if scan_cache:
+            scan_cache.put(file_path, density=[vis_count, char_count])
 
     # 視覚密度チェック（新形式Office）
-    if ext in config.office_extensions_new:
+    if category == 'office_new':
         ratio = char_count / vis_count if vis_count > 0 else 9999
-        is_dense_visual = ratio < config.visual_density_threshold
-        if is_dense_visual or vis_count >= 5:
+        if _is_visual_dense(vis_count, char_count, config):
             logger.info(f"  [Auto-Switch] High density detected (Visuals: {vis_count}). Converting to PDF...")
-            target_pdf_name = get_output_filename(root_path, file_path, extension=".pdf")
+            target_pdf_name = namer(file_path, ".pdf")
             final_pdf_path = output_dir / target_pdf_name
+            if _reuse_pdf(file_path, ext, final_pdf_path, merged_dir, config, outcome, scan_cache):
+                outcome.report_items.append(_ReportItem(file, vis_count, char_count, ratio, "Converted to PDF"))
+                return outcome
             
-            pdf_result = convert_to_pdf_via_libreoffice(file_path, output_dir)
-            
-            if pdf_result:
-                try:
-                    if pdf_result != final_pdf_path:
-                        if final_pdf_path.exists():
-                            final_pdf_path.unlink()
-                        pdf_result.rename(final_pdf_path)
-                    
-                    report_items.append((file, vis_count, char_count, ratio, "Converted to PDF"))
-                    logger.info(f"    -> Success: {target_pdf_name}")
-                    summary.add_result(FileResult(path=str(file_path), status="converted", output=target_pdf_name, file_type=ext))
-                    
-                    if merger:
-                        try:
-                            shutil.copy2(final_pdf_path, merger.output_dir / target_pdf_name)
-                        except Exception as e:
-                            logger.error(f"Error copying PDF: {e}")
-                except Exception as e:
-                    logger.error(f"    Error renaming PDF: {e}")
-            else:
-                logger.warning("    [Fallback] PDF conversion failed.")
-                report_items.append((file, vis_count, char_count, ratio, "Kept Original (PDF Fail)"))
-            return True
-        else:
-            markdown_content = convert_with_markitdown(file_path)
+            # 変換はまとめて行う（_FileScheduler が PDF_BATCH_SIZE 件ずつ soffice に渡す）
+            outcome.pdf_request = _PdfRequest(
+                file_path, file, ext, final_pdf_path, merged_dir,
+                report_item=_ReportItem(file, vis_count, char_count, ratio), merge_mode=config.merge_mode
+            )
+            return outcome
 
     # 2. PDF Files
-    elif ext == '.pdf':
+    elif category == 'pdf':
         logger.info(f"Copying PDF: {file}")
-        output_filename = get_output_filename(root_path, file_path, extension=".pdf")
+        output_filename = namer(file_path, ".pdf")
+        if _reuse_pdf(file_path, ext, output_dir / output_filename, merged_dir, config, outcome, scan_cache):
+            return outcome
+        staged_path = None
         try:
-            shutil.copy2(file_path, output_dir / output_filename)
-            summary.add_result(FileResult(path=str(file_path), status="converted", output=output_filename, file_type=ext))
-        except Exception:
-            pass
-        if merger:
-            try:
-                shutil.copy2(file_path, merger.output_dir / output_filename)
-            except Exception as e:
-                logger.error(f"Error copying PDF: {e}")
-        return True
+            staged_path = _staging_path(output_dir / output_filename)
+            fast_copy(file_path, staged_path)
+        except Exception as e:
+            logger.error(f"Error copying PDF: {e}")
+            if staged_path:
+                _discard(staged_path)
+            return outcome
+        outcome.pdf_output = _PdfOutput(
+            staged_path, output_dir / output_filename, merged_dir, config.merge_mode,
+            FileResult(path=str(file_path), status="converted", output=output_filename, file_type=ext)
+        )
+        return outcome
 
     # 3. Legacy Office
-    elif ext in config.office_extensions_legacy:
+    elif category == 'office_legacy':
         if ext == '.ppt' and config.skip_ppt:
             logger.info(f"Skipping PPT (Legacy): {file}")
-            return False
+            return outcome
         logger.info(f"Processing Legacy Office[{ext}]: {file}")
-        markdown_content = convert_with_markitdown(file_path)
+        markdown_content = _convert_markdown(file_path, markdown_executor)
         if markdown_content is None:
             logger.warning(f"    [Warning] Could not convert: {file}")
-            return False
+            return outcome
 
     # 4. MarkItDown対応形式
-    elif ext in config.markitdown_extensions:
+    elif category == 'markitdown':
         logger.info(f"Processing MarkItDown[{ext}]: {file}")
-        markdown_content = convert_with_markitdown(file_path)
+        markdown_content = _convert_markdown(file_path, markdown_executor)
         if markdown_content is None:
             logger.warning(f"    [Warning] Could not convert: {file}")
-            return False
+            return outcome
 
     # 5. Visio
-    elif ext in config.visio_extensions:
+    elif category == 'visio':
         logger.info(f"Processing Visio: {file}")
-        target_pdf_name = get_output_filename(root_path, file_path, extension=".pdf")
+        target_pdf_name = namer(file_path, ".pdf")
         final_pdf_path = output_dir / target_pdf_name
-        
-        pdf_result = convert_to_pdf_via_libreoffice(file_path, output_dir)
-        if pdf_result:
-            try:
-                if pdf_result != final_pdf_path:
-                    if final_pdf_path.exists():
-                        final_pdf_path.unlink()
-                    pdf_result.rename(final_pdf_path)
-                logger.info(f"    -> Success: {target_pdf_name}")
-                summary.add_result(FileResult(path=str(file_path), status="converted", output=target_pdf_name, file_type=ext))
-                if merger:
-                    try:
-                        shutil.copy2(final_pdf_path, merger.output_dir / target_pdf_name)
-                    except Exception as e:
-                        logger.error(f"Error copying Visio PDF: {e}")
-            except Exception as e:
-                logger.error(f"    Error renaming Visio PDF: {e}")
-        else:
-            logger.warning(f"    [Warning] Could not convert Visio: {file}")
-        return True
+        if _reuse_pdf(file_path, ext, final_pdf_path, merged_dir, config, outcome, scan_cache):
+            return outcome
+        outcome.pdf_request = _PdfRequest(file_path, file, ext, final_pdf_path, merged_dir,
+                                          merge_mode=config.merge_mode)
+        return outcome
 
     # 6. 画像
-    elif ext in config.image_extensions:
+    elif category == 'image':
         logger.info(f"Processing Image: {file}")
-        target_pdf_name = get_output_filename(root_path, file_path, extension=".pdf")
+        target_pdf_name = namer(file_path, ".pdf")
         final_pdf_path = output_dir / target_pdf_name
+        if _reuse_pdf(file_path, ext, final_pdf_path, merged_dir, config, outcome, scan_cache):
+            return outcome
         
-        pdf_result = convert_image_to_pdf(file_path, output_dir)
-        if pdf_result:
-            try:
-                if pdf_result != final_pdf_path:
-                    if final_pdf_path.exists():
-                        final_pdf_path.unlink()
-                    pdf_result.rename(final_pdf_path)
-                logger.info(f"    -> Success: {target_pdf_name}")
-                summary.add_result(FileResult(path=str(file_path), status="converted", output=target_pdf_name, file_type=ext))
-                if merger:
-                    try:
-                        shutil.copy2(final_pdf_path, merger.output_dir / target_pdf_name)
-                    except Exception as e:
-                        logger.error(f"Error copying image PDF: {e}")
-            except Exception as e:
-                logger.error(f"    Error renaming image PDF: {e}")
+        try:
+            staged_path = _convert_to_staged_pdf(convert_image_to_pdf, file_path, final_pdf_path)
+        except Exception as e:
+            logger.error(f"    Error renaming image PDF: {e}")
+            return outcome
+        if staged_path:
+            logger.info(f"    -> Success: {target_pdf_name}")
+            outcome.pdf_output = _PdfOutput(
+                staged_path, final_pdf_path, merged_dir, config.merge_mode,
+                FileResult(path=str(file_path), status="converted", output=target_pdf_name, file_type=ext)
+            )
         else:
             logger.warning(f"    [Warning] Could not convert image: {file}")
-        return True
+        return outcome
 
     # 7. テキストファイル
-    elif ext not in config.office_extensions_all and ext != '.pdf':
-        mime_is_text = is_likely_text_by_mime(file_path)
-        is_known_text = ext in config.text_extensions
-        detected_encoding = None
-        
-        if is_known_text or mime_is_text == True:
-            is_readable, detected_encoding = is_text_file(file_path)
-            if not detected_encoding:
-                detected_encoding = 'utf-8'
-        elif mime_is_text == False:
-            logger.debug(f"[Skipped Binary] {file}")
-            summary.add_result(FileResult(path=str(file_path), status="skipped", file_type="binary"))
-            return False
+    else:
+        cached = scan_cache.get(file_path) if scan_cache else None
+        if cached and 'text_encoding' in cached:
+            detected_encoding = cached['text_encoding']
         else:
-            is_readable, detected_encoding = is_text_file(file_path)
-            if not is_readable:
-                logger.debug(f"[Skipped Binary] {file}")
-                summary.add_result(FileResult(path=str(file_path), status="skipped", file_type="binary"))
-                return False
+            detected_encoding = _detect_text_encoding(file_path, category == 'text')
+            if scan_cache:
+                scan_cache.put(file_path, text_encoding=detected_encoding)
+        if detected_encoding is None:
+            logger.debug(f"[Skipped Binary] {file}")
+            outcome.results.append(FileResult(path=str(file_path), status="skipped", file_type="binary"))
+            return outcome
         
         logger.info(f"Processing Text[{ext}] ({detected_encoding}): {file}")
         try:
             with open(file_path, 'r', encoding=detected_encoding, errors='replace') as f:
-                markdown_content = f.read()
-                # 不可視文字（ゼロ幅スペース等）を除去
-                markdown_content = sanitize_content(markdown_content)
+                # 不可視文字（ゼロ幅スペース等）を除去（下のMarkdown出力で再度除去しない）
+                markdown_content = sanitize_content(f.read())
+                sanitized = True
                 if not markdown_content.strip():
                     markdown_content = "(Empty File)"
         except Exception as e:
@@ -376,14 +1011,12 @@ def _process_single_file(
     # Markdown出力
     if markdown_content:
         # 全てのコンテンツから不可視文字を除去（MarkItDown変換後も含む）
-        markdown_content = sanitize_content(markdown_content)
-        output_filename = get_output_filename(root_path, file_path, extension=".md")
+        if not sanitized:
+            markdown_content = sanitize_content(markdown_content)
+        output_filename = namer(file_path, ".md")
         output_path = output_dir / output_filename
         
-        try:
-            rel_path_str = str(file_path.relative_to(root_path))
-        except ValueError:
-            rel_path_str = file if isinstance(file, str) else file.name
+        rel_path_str = relative_path_str(root_path, file_path) or file
 
         metadata_header = f"""# File Info
 - Original Filename: {file}
@@ -392,20 +1025,19 @@ def _process_single_file(
 
 ---
 """
-        final_content = metadata_header + markdown_content + "\n\n---\n\n"
+        # ヘッダー・本文・区切りは連結せずに個別にエンコードして書き出す（本文のコピーを増やさない）
+        # エンコード結果はマージ出力でもそのまま使う
+        chunks = (metadata_header.encode('utf-8'), markdown_content.encode('utf-8'), CONTENT_TRAILER_BYTES)
 
-        try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(final_content)
-            summary.add_result(FileResult(path=str(file_path), status="converted", output=output_filename, file_type=ext))
-        except Exception as e:
-            logger.error(f"Failed to write {output_path}: {e}")
-            summary.add_result(FileResult(path=str(file_path), status="error", error_message=str(e), file_type=ext))
+        # 書き込みは _FileScheduler が投入順に行う（同じ出力名なら後のファイルの内容が残る）
+        file_result = FileResult(path=str(file_path), status="converted", output=output_filename, file_type=ext)
+        outcome.markdown_output = (output_path, chunks, file_result)
         
-        if merger:
-            merger.add_content(output_filename, final_content)
+        if merged_dir:
+            merged_chars = len(metadata_header) + len(markdown_content) + len(CONTENT_TRAILER)
+            outcome.merged_content = (output_filename, chunks, merged_chars)
     
-    return True
+    return outcome
 
 
 def run() -> int:
@@ -436,12 +1068,7 @@ def run() -> int:
     output_dir.mkdir(exist_ok=True)
 
     # ログ設定
-    logger = setup_logging(output_dir, verbose=config.verbose)
-    
-    if config.quiet:
-        for handler in logger.handlers:
-            if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
-                handler.setLevel(logging.CRITICAL)
+    logger = setup_logging(output_dir, verbose=config.verbose, quiet=config.quiet)
     
     # 処理サマリー初期化
     summary = ProcessingSummary(target_path=str(target_path))
@@ -450,9 +1077,9 @@ def run() -> int:
     if config.dry_run:
         logger.info("=== DRY-RUN MODE ===")
         logger.info("Following files would be processed:")
-        for root, dirs, files in os.walk(target_path):
-            for file in files:
-                logger.info(f"  - {Path(root) / file}")
+        for entry in _iter_files(str(target_path)):
+            if not entry.name.startswith('.'):
+                logger.info(f"  - {entry.path}")
         logger.info("Dry-run complete. No files were actually processed.")
         return 0
 
@@ -469,7 +1096,11 @@ def run() -> int:
         logger.info(f"Merged: {merged_dir}")
         logger.info("-" * 50)
         
-        merger = MergedOutputManager(merged_dir, max_chars_per_volume=config.max_chars_per_volume)
+        merger = MergedOutputManager(
+            merged_dir,
+            max_chars_per_volume=config.max_chars_per_volume,
+            max_bytes_per_volume=config.merge_volume_size,
+        )
     else:
         logger.info(f"Target: {target_path}")
         logger.info(f"Output: {output_dir}")
@@ -479,18 +1110,59 @@ def run() -> int:
     report_items = []
     password_protected_files = []
     
-    password_protected_files = process_directory(
-        target_path, root_processing_path, output_dir, config,
-        report_items, merger, summary, password_protected_files=password_protected_files,
-        show_progress=not config.quiet  # quietモード時はプログレスバー無効
-    )
+    # 個別出力ファイルの書き込みは専用スレッドで行う
+    writer = BackgroundWriter()
+    # ファイル単位の変換は --jobs 本のスレッドで並列実行する
+    executor = ThreadPoolExecutor(max_workers=config.jobs) if config.jobs > 1 else None
+    # 逐次処理でもPDF変換は専用スレッドで行い、走査・解析と重ねる
+    pdf_executor = None if executor else ThreadPoolExecutor(max_workers=1, thread_name_prefix="notebooklm-pdf")
+    # MarkItDown変換はGILを解放しないため、並列時はプロセスプールで行う
+    # （スレッド動作中のforkを避けるためspawnで起動し、ログはキュー経由でメインプロセスに集める）
+    markdown_executor = None
+    log_listener = None
+    if executor:
+        mp_context = multiprocessing.get_context("spawn")
+        log_queue = mp_context.Queue()
+        log_listener = start_worker_log_listener(log_queue)
+        markdown_executor = ProcessPoolExecutor(
+            max_workers=config.jobs, mp_context=mp_context,
+            initializer=init_worker_logging, initargs=(log_queue, logger.level)
+        )
+    # 前回実行時の判定結果（--full-rebuild なら使わない）
+    scan_cache_file = output_dir / SCAN_CACHE_FILE
+    if config.full_rebuild:
+        scan_cache = ScanCache(root_processing_path)
+    else:
+        scan_cache = ScanCache.load(scan_cache_file, root_processing_path)
+    scheduler = _FileScheduler(executor, summary, report_items, merger, max_pending=config.jobs * 2,
+                               pdf_executor=pdf_executor, markdown_executor=markdown_executor,
+                               scan_cache=scan_cache, writer=writer)
+    try:
+        password_protected_files = process_directory(
+            target_path, root_processing_path, output_dir, config,
+            report_items, merger, summary, password_protected_files=password_protected_files,
+            show_progress=not config.quiet,  # quietモード時はプログレスバー無効
+            scheduler=scheduler
+        )
+        scheduler.drain()
+    finally:
+        for pool in (executor, pdf_executor, markdown_executor):
+            if pool:
+                pool.shutdown(wait=True)
+        if log_listener:
+            log_listener.stop()
+        writer.close()
     
     # Finalize Merge
     if merger:
         merger.finalize()
 
     # サマリー保存
-    summary_file = summary.save(output_dir)
+    summary_file = summary.save(output_dir, pretty=config.pretty_report)
+    try:
+        scan_cache.save(scan_cache_file)
+    except OSError as e:
+        logger.warning(f"Failed to save scan cache: {e}")
 
     logger.info("")
     logger.info("=" * 60)
@@ -510,8 +1182,8 @@ def run() -> int:
     if password_protected_files:
         logger.warning("\n[!] PASSWORD PROTECTED FILES (Could not process)")
         logger.warning("-" * 60)
-        for pf in password_protected_files:
-            logger.warning(f"  - {pf}")
+        # 行ごとにログを出さず、一覧を1件のログとして出力する
+        logger.warning("\n".join(f"  - {pf}" for pf in password_protected_files))
         logger.warning("-" * 60)
         logger.warning(f"  Total: {len(password_protected_files)} file(s)")
     
@@ -519,9 +1191,13 @@ def run() -> int:
         logger.info("\n[!] PROCESSED FILE REPORT (Visual Density)")
         logger.info(f" {'Filename':<40} | {'Visuals':<7} | {'Density':<7} | {'Status'}")
         logger.info("-" * 90)
-        for (fname, v, c, r, status) in report_items:
-            rating = "High" if r < config.visual_density_threshold else "Low"
-            logger.info(f" {fname:<40} | {v:>7} | {int(r):>5} ({rating}) | {status}")
+        # 行ごとにログを出さず、表全体を1件のログとして出力する
+        threshold = config.visual_density_threshold
+        logger.info("\n".join(
+            f" {item.file:<40} | {item.visuals:>7} | {int(item.ratio):>5} "
+            f"({'High' if item.ratio < threshold else 'Low'}) | {item.status}"
+            for item in report_items
+        ))
         logger.info("-" * 90)
     
     return 0
@@ -2,62 +2,144 @@
 """Smart Chunking & Merged Outputモジュール"""
 
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Sequence, Tuple, Union
 
 from .logger import get_logger
 
 # 安全弁: 1ファイルあたりの最大分割数
 MAX_PARTS = 10000
 
+# ボリューム書き出し時のバッファサイズ（1MB）
+WRITE_BUFFER_SIZE = 1 << 20
+
+# ボリューム先頭の目次の固定部分
+TOC_HEADER = "# Table of Contents\n"
+TOC_FOOTER = "\n\n---\n\n"
+
 
 class MergedOutputManager:
     """
     ファイルを結合してNotebookLM用に最適化されたサイズで出力する
     
+    コンテンツは追加時に一度だけUTF-8へエンコードして保持し、
+    文字数とバイト数の両方でボリュームサイズを管理する。
+    各エントリはバッファのタプル（Partヘッダーと本文など）として保持し、
+    書き出し時まで連結しない。
+    ボリュームサイズの判定には目次と区切りの改行も含め、書き出したファイルが
+    上限を超えないようにする。
+    
     Attributes:
         output_dir: 出力ディレクトリ
         max_chars_per_volume: ボリュームあたりの最大文字数
+        max_bytes_per_volume: ボリュームあたりの最大バイト数（UTF-8, Noneなら無制限）
         current_vol: 現在のボリューム番号
     """
-    
-    def __init__(self, output_dir: Path, max_chars_per_volume: int = 10500000):
+
+    def __init__(self, output_dir: Path, max_chars_per_volume: int = 10500000,
+                 max_bytes_per_volume: Optional[int] = None):
         """
         初期化
         
         Args:
             output_dir: 出力ディレクトリ
             max_chars_per_volume: ボリュームあたりの最大文字数（デフォルト約35MB）
+            max_bytes_per_volume: ボリュームあたりの最大バイト数（Noneなら文字数のみで判定）
         """
         self.output_dir = output_dir
         self.output_dir.mkdir(exist_ok=True)
         self.max_chars_per_volume = max_chars_per_volume
+        self.max_bytes_per_volume = max_bytes_per_volume
         self.current_vol = 1
-        self.current_content: List[str] = []
+        self.current_content: List[Tuple[bytes, ...]] = []
         self.current_char_count = 0
+        self.current_byte_count = 0
+        self.current_overhead_chars = 0  # 目次と区切りの改行の文字数
+        self.current_overhead_bytes = 0
         self.file_index: List[str] = []
 
-    def add_content(self, filename: str, content: str):
+    def _entry_overhead(self, index_name: str, empty_volume: bool) -> Tuple[int, int]:
+        """
+        エントリ1件の追加で増える目次・区切りの (文字数, バイト数)
+        
+        目次行 "- name\n" と本文間の改行1つ分。空のボリュームには目次の固定部分も加える。
+        """
+        chars = len(index_name) + 4
+        nbytes = len(index_name.encode('utf-8')) + 4
+        if empty_volume:
+            chars += len(TOC_HEADER) + len(TOC_FOOTER)
+            nbytes += len(TOC_HEADER) + len(TOC_FOOTER)
+        return chars, nbytes
+
+    def _exceeds(self, chars: int, nbytes: int, index_name: str, empty_volume: bool = False) -> bool:
+        """
+        指定サイズのエントリを追加するとボリュームが上限を超えるか
+        
+        empty_volume=True の場合は現在の内容に関係なく、空のボリュームに追加した場合で判定する。
+        """
+        is_empty = empty_volume or not self.current_content
+        overhead_chars, overhead_bytes = self._entry_overhead(index_name, is_empty)
+        total_chars = overhead_chars + chars
+        total_bytes = overhead_bytes + nbytes
+        if not empty_volume:
+            total_chars += self.current_char_count + self.current_overhead_chars
+            total_bytes += self.current_byte_count + self.current_overhead_bytes
+        if total_chars > self.max_chars_per_volume:
+            return True
+        return self.max_bytes_per_volume is not None and total_bytes > self.max_bytes_per_volume
+
+    def _is_full(self) -> bool:
+        """現在のボリュームが上限に達しているか"""
+        if self.current_char_count + self.current_overhead_chars >= self.max_chars_per_volume:
+            return True
+        return (self.max_bytes_per_volume is not None
+                and self.current_byte_count + self.current_overhead_bytes >= self.max_bytes_per_volume)
+
+    def _append(self, index_name: str, parts: Tuple[bytes, ...], char_count: int):
+        """エンコード済みバッファ（の組）を1エントリとして現在のボリュームに追加する"""
+        overhead_chars, overhead_bytes = self._entry_overhead(index_name, not self.current_content)
+        self.current_content.append(parts)
+        self.file_index.append(index_name)
+        self.current_char_count += char_count
+        self.current_byte_count += sum(len(p) for p in parts)
+        self.current_overhead_chars += overhead_chars
+        self.current_overhead_bytes += overhead_bytes
+
+    def add_content(self, filename: str, content: Union[str, Sequence[str]]):
         """
         コンテンツを追加する
         
         Args:
             filename: ファイル名
-            content: コンテンツ
+            content: コンテンツ（文字列、または連結せずにこの順で書き出す文字列のシーケンス）
         """
-        content_len = len(content)
+        parts = (content,) if isinstance(content, str) else tuple(content)
+        self.add_encoded(filename, tuple(p.encode('utf-8') for p in parts), sum(len(p) for p in parts))
 
-        # 巨大ファイルの場合は分割
-        if content_len > self.max_chars_per_volume:
-            self._handle_huge_file(filename, content)
+    def add_encoded(self, filename: str, data: Sequence[bytes], char_count: int):
+        """
+        UTF-8へエンコード済みのコンテンツを追加する
+        
+        個別出力ファイル用にエンコードしたバッファをそのまま受け取り、再エンコードしない
+        （バッファは書き出し時まで共有される）。
+        
+        Args:
+            filename: ファイル名
+            data: 連結せずにこの順で書き出すエンコード済みバッファのシーケンス
+            char_count: コンテンツ全体の文字数
+        """
+        data = tuple(data)
+        nbytes = sum(len(d) for d in data)
+        
+        # 巨大ファイル（空のボリュームにも収まらない）の場合は分割（行単位の分割のためここでだけ連結する）
+        if self._exceeds(char_count, nbytes, filename, empty_volume=True):
+            self._handle_huge_file(filename, b"".join(data).decode('utf-8'))
             return
-
+        
         # バッファオーバーフローの場合はフラッシュ
-        if self.current_char_count + content_len > self.max_chars_per_volume:
+        if self._exceeds(char_count, nbytes, filename):
             self._flush_volume()
-
-        self.current_content.append(content)
-        self.current_char_count += content_len
-        self.file_index.append(filename)
+        
+        self._append(filename, data, char_count)
 
     def _handle_huge_file(self, filename: str, content: str):
         """
@@ -66,89 +148,141 @@ class MergedOutputManager:
         行の途中で切断されないよう、行単位で処理を行う。
         1行を追加するとサイズオーバーになる場合は、先にボリュームを閉じてから追加する。
         これにより、行が途中で切れることを完全に防ぐ。
+        サイズ判定にはPartヘッダーと目次の行も含める（1行だけで上限を超える場合を除き、
+        ボリュームは上限を超えない）。Partヘッダーを含めた残りサイズはPartの開始時と
+        ボリュームの切り替え時にだけ計算し、行ごとの判定は整数の比較だけで行う。
+        
+        コンテンツは一度だけUTF-8へエンコードし、各Partはmemoryviewのスライスから
+        切り出す。文字列側とバイト列側の改行位置を並行して探索することで、
+        行ごとのエンコードや行リストの生成を行わずに文字数・バイト数を求める。
         """
         logger = get_logger()
-        lines = content.split('\n')
+        data = content.encode('utf-8')
+        view = memoryview(data)
+        total_chars = len(content)
+        total_bytes = len(data)
+        
         part_num = 1
-        current_part_lines = []
-        current_part_size = 0
+        part_start = 0          # 現在のPartの開始バイト位置
+        part_end = 0            # 現在のPartの終了バイト位置（改行を含む）
+        part_chars = 0
+        part_bytes = 0
+        part_has_tail = False   # 末尾行（改行なし）を含むか
+        char_pos = 0
+        byte_pos = 0
+        # 現在のPartの本文に使える残りサイズ（Partの開始時とボリュームの切り替え時にだけ計算）
+        budget_chars, budget_bytes = self._part_budget(filename, part_num)
         
-        for line in lines:
-            line_with_newline = line + '\n'
-            line_len = len(line_with_newline)
-            
-            # Partヘッダーのサイズを計算
-            part_header = f"\n\n# {filename} (Part {part_num})\n\n"
-            header_len = len(part_header) if not current_part_lines else 0
-            
-            # この行を追加した場合の合計サイズ
-            projected_total = self.current_char_count + header_len + current_part_size + line_len
-            
-            if projected_total > self.max_chars_per_volume and current_part_lines:
-                # 現在のPartを確定して追加
-                part_header = f"\n\n# {filename} (Part {part_num})\n\n"
-                full_chunk = part_header + ''.join(current_part_lines)
-                
-                self.current_content.append(full_chunk)
-                self.file_index.append(f"{filename} (Part {part_num})")
-                self.current_char_count += len(full_chunk)
-                
-                if self.current_char_count >= self.max_chars_per_volume:
-                    self._flush_volume()
-                
-                # 新しいPartを開始
-                part_num += 1
-                current_part_lines = [line_with_newline]
-                current_part_size = line_len
-                
-                if part_num > MAX_PARTS:
-                    logger.warning(f"Max parts ({MAX_PARTS}) reached for {filename}. File may be truncated.")
-                    break
+        while True:
+            # 次の改行位置（文字列とバイト列で同じ改行を指す）
+            char_end = content.find('\n', char_pos)
+            is_last = char_end == -1
+            if is_last:
+                char_end = total_chars
+                byte_end = total_bytes
             else:
-                # 行を現在のPartに追加
-                current_part_lines.append(line_with_newline)
-                current_part_size += line_len
-        
-        # 残りの行を追加
-        if current_part_lines:
-            part_header = f"\n\n# {filename} (Part {part_num})\n\n"
-            
-            if self.current_char_count + len(part_header) > self.max_chars_per_volume:
-                self._flush_volume()
+                byte_end = data.find(b'\n', byte_pos)
+            # 各行は改行込みで数える（末尾行にも改行を補う）
+            line_len = char_end - char_pos + 1
+            line_bytes = byte_end - byte_pos + 1
             
-            full_chunk = part_header + ''.join(current_part_lines)
+            if part_chars + line_len > budget_chars or part_bytes + line_bytes > budget_bytes:
+                if part_bytes:
+                    # 現在のPartを確定して追加し、新しいPartを開始
+                    self._append_part(filename, part_num, (view[part_start:part_end],), part_chars)
+                    part_num += 1
+                    part_start = byte_pos
+                    part_chars = 0
+                    part_bytes = 0
+                    budget_chars, budget_bytes = self._part_budget(filename, part_num)
+                # 新しいPartの先頭行も収まらなければ、先にボリュームを閉じる
+                if line_len > budget_chars or line_bytes > budget_bytes:
+                    self._flush_volume()
+                    budget_chars, budget_bytes = self._part_budget(filename, part_num)
             
-            self.current_content.append(full_chunk)
-            self.file_index.append(f"{filename} (Part {part_num})")
-            self.current_char_count += len(full_chunk)
+            # 行を現在のPartに追加
+            part_chars += line_len
+            part_bytes += line_bytes
+            part_end = byte_end if is_last else byte_end + 1
+            part_has_tail = is_last
             
-            if self.current_char_count >= self.max_chars_per_volume:
-                self._flush_volume()
+            if part_num > MAX_PARTS:
+                logger.warning(f"Max parts ({MAX_PARTS}) reached for {filename}. File may be truncated.")
+                break
+            if is_last:
+                break
+            char_pos = char_end + 1
+            byte_pos = byte_end + 1
+        
+        # 残りの行を追加（サイズは上のループで確認済み）
+        body = (view[part_start:part_end],)
+        if part_has_tail:
+            body += (b'\n',)
+        self._append_part(filename, part_num, body, part_chars)
+        
+        if self._is_full():
+            self._flush_volume()
+
+    def _part_budget(self, filename: str, part_num: int) -> Tuple[int, float]:
+        """
+        現在のボリュームに追加するPartの本文に使える (文字数, バイト数)
+        
+        Partヘッダーと目次・区切りの分を差し引いた残りサイズ。バイト数の上限がなければ無限大。
+        """
+        part_name = f"{filename} (Part {part_num})"
+        part_header = f"\n\n# {part_name}\n\n"
+        overhead_chars, overhead_bytes = self._entry_overhead(part_name, not self.current_content)
+        budget_chars = (self.max_chars_per_volume - self.current_char_count - self.current_overhead_chars
+                        - overhead_chars - len(part_header))
+        if self.max_bytes_per_volume is None:
+            return budget_chars, float('inf')
+        budget_bytes = (self.max_bytes_per_volume - self.current_byte_count - self.current_overhead_bytes
+                        - overhead_bytes - len(part_header.encode('utf-8')))
+        return budget_chars, budget_bytes
+
+    def _append_part(self, filename: str, part_num: int, body: Tuple, part_chars: int):
+        """
+        Partヘッダーを付けて分割チャンクを追加する
+        
+        本文はmemoryviewのスライスのまま保持し、ヘッダーと連結したコピーは作らない。
+        """
+        part_header = f"\n\n# {filename} (Part {part_num})\n\n"
+        self._append(f"{filename} (Part {part_num})", (part_header.encode('utf-8'),) + body,
+                     len(part_header) + part_chars)
 
     def _flush_volume(self):
         """現在のバッファをファイルに書き出す"""
         if not self.current_content:
             return
-
+        
         vol_filename = f"Merged_Files_Vol{self.current_vol:02d}.md"
         output_path = self.output_dir / vol_filename
         
         # 目次生成
-        index_text = "# Table of Contents\n" + "\n".join([f"- {name}" for name in self.file_index]) + "\n\n---\n\n"
-        full_text = index_text + "\n".join(self.current_content)
+        index_text = TOC_HEADER + "\n".join([f"- {name}" for name in self.file_index]) + TOC_FOOTER
         
         logger = get_logger()
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(full_text)
-            logger.info(f"[Merged Created] {vol_filename} ({len(full_text)} chars)")
+            # 巨大な結合文字列を作らず、エンコード済みチャンクをそのまま書き出す
+            with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                f.write(index_text.encode('utf-8'))
+                for i, parts in enumerate(self.current_content):
+                    if i:
+                        f.write(b"\n")
+                    for part in parts:
+                        f.write(part)
+            total_chars = len(index_text) + self.current_char_count + len(self.current_content) - 1
+            logger.info(f"[Merged Created] {vol_filename} ({total_chars} chars)")
         except Exception as e:
             logger.error(f"Error writing volume {vol_filename}: {e}")
-
+        
         # リセット
         self.current_vol += 1
         self.current_content = []
         self.current_char_count = 0
+        self.current_byte_count = 0
+        self.current_overhead_chars = 0
+        self.current_overhead_bytes = 0
         self.file_index = []
 
     def finalize(self):
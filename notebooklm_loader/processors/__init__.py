@@ -1,10 +1,11 @@
 # notebooklm_loader/processors/__init__.py
 """ファイル処理モジュール"""
 
-from .file_processor import is_text_file, get_mime_type, is_likely_text_by_mime
+from .file_processor import is_text_file, get_mime_type, is_likely_text_by_mime, read_head
 
 __all__ = [
     'is_text_file',
     'get_mime_type',
     'is_likely_text_by_mime',
+    'read_head',
 ]
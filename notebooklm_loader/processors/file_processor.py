@@ -1,47 +1,155 @@
 # notebooklm_loader/processors/file_processor.py
 """ファイル判定モジュール"""
 
-import chardet
-from typing import Tuple, Optional
+import codecs
+import os
+import threading
+from chardet import UniversalDetector
+from typing import Dict, Tuple, Optional
 
 try:
     import magic
     HAS_MAGIC = True
-    # MIMEタイプ判定用インスタンス（再利用）
-    _mime_detector = magic.Magic(mime=True)
 except ImportError:
     HAS_MAGIC = False
-    _mime_detector = None
 
+try:
+    # C拡張の文字コード判定（faust-cchardet）。なければchardetを使う
+    import cchardet
+    HAS_CCHARDET = True
+except ImportError:
+    HAS_CCHARDET = False
+
+# MIMEタイプ判定用インスタンス（スレッドごとに生成して再利用）
+_magic_local = threading.local()
+
+# テキスト判定で読む先頭バイト数（先頭8KB程度読んで判定）
+HEAD_SIZE = 8000
+
+# 文字コード判定器に渡すチャンクサイズ（判定が確定した時点で打ち切る）
+DETECT_CHUNK_SIZE = 512
+
+# NULバイトの有無でバイナリと判定する範囲（chardetより前に行う安価な判定）
+NUL_CHECK_SIZE = 4096
+
+# NULバイトを含んでいてもテキストになり得るBOM（UTF-16/32）
+_WIDE_BOMS = (codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+# 先頭がこれらで始まるファイルはバイナリ（PDF・ZIP・画像・実行ファイルなど）
+# テキストの書き出しと紛れないよう、制御文字・非ASCIIを含むもの（とPDF）に限る
+_BINARY_SIGNATURES = (
+    b'%PDF-', b'PK\x03\x04', b'\x7fELF', b'\x89PNG', b'\xff\xd8\xff',
+    b'\xd0\xcf\x11\xe0', b'7z\xbc\xaf', b'\x1f\x8b',
+)
+
+# MIME判定に使う先頭バイト数（シグネチャ判定には先頭数百バイトで足りる）
+MIME_HEAD_SIZE = 2048
 
-def is_text_file(file_path) -> Tuple[bool, Optional[str]]:
+# MIME判定結果のキャッシュ（キー: (パス, 更新日時ns, サイズ)）
+MIME_CACHE_SIZE = 4096
+_mime_cache: Dict[Tuple[str, int, int], str] = {}
+
+
+def _get_mime_detector():
+    """
+    呼び出しスレッド用のMIME判定器を返す（初回のみ生成）
+    
+    magic.Magic はlibmagicのハンドルを1つ保持しており、スレッド間で共有すると
+    呼び出しが直列化されるため、並列変換ではスレッドごとに持つ。
+    """
+    if not HAS_MAGIC:
+        return None
+    detector = getattr(_magic_local, "detector", None)
+    if detector is None:
+        detector = magic.Magic(mime=True)
+        _magic_local.detector = detector
+    return detector
+
+
+def read_head(file_path, size: int = HEAD_SIZE) -> bytes:
+    """
+    ファイルの先頭を読み込む
+    
+    MIME判定とテキスト判定で同じバッファを使い回すために使う。
+    
+    Args:
+        file_path: 対象ファイルのパス
+        size: 読み込む最大バイト数
+        
+    Returns:
+        先頭のバイト列
+    """
+    with open(file_path, 'rb') as f:
+        return f.read(size)
+
+
+def is_text_file(file_path, head: Optional[bytes] = None) -> Tuple[bool, Optional[str]]:
     """
     chardetを使ってテキストファイルかどうか判定する
     
+    既知のバイナリ形式のシグネチャで始まるファイルと、先頭4KBにNULバイトを含む
+    ファイル（UTF-16/32のBOM付きを除く）はchardetを使わずにバイナリと判定し、
+    ASCIIのみのファイルとBOMなしでUTF-8として読めるファイルは
+    判定器を使わずに判定する。それ以外は cchardet があれば
+    先頭バッファを一括で判定し、なければ UniversalDetector に
+    512バイトずつ渡して判定が確定した時点で打ち切る。
+    
     Args:
         file_path: 対象ファイルのパス
+        head: read_head() で読み込み済みの先頭バイト列（Noneなら読み込む）
         
     Returns:
         (is_text, encoding): テキストファイルかどうかとエンコーディングのタプル
     """
     try:
-        with open(file_path, 'rb') as f:
-            raw = f.read(8000)  # 先頭8KB程度読んで判定
+        raw = head if head is not None else read_head(file_path)
         
         if not raw:
             return True, 'utf-8'  # 空ファイルはテキスト扱い
         
-        result = chardet.detect(raw)
+        # 既知のバイナリ形式はシグネチャだけで判定する（PDFなどは先頭にNULバイトを含まないことが多い）
+        if raw.startswith(_BINARY_SIGNATURES):
+            return False, None
+        
+        # NULバイトを含むものはバイナリ（file(1)と同じ判定）
+        if b'\x00' in raw[:NUL_CHECK_SIZE] and not raw.startswith(_WIDE_BOMS):
+            return False, None
+        
+        # ASCIIのみなら判定器を使わない（chardetはASCIIでは判定が確定せず全バッファを調べる）
+        if raw.isascii():
+            return True, 'ascii'
+        
+        # UTF-8として読めるなら判定器を使わない（他の文字コードの非ASCIIバイト列が
+        # UTF-8として正しい並びになることはまずない）。BOM付きは判定器に任せる
+        if not raw.startswith(codecs.BOM_UTF8):
+            try:
+                codecs.getincrementaldecoder('utf-8')().decode(raw, final=False)
+                return True, 'utf-8'
+            except UnicodeDecodeError:
+                pass
+        
+        if HAS_CCHARDET:
+            result = cchardet.detect(raw)
+            # cchardetは大文字のエンコーディング名を返すため、chardetに合わせて小文字にする
+            if result.get('encoding'):
+                result['encoding'] = result['encoding'].lower()
+        else:
+            detector = UniversalDetector()
+            for pos in range(0, len(raw), DETECT_CHUNK_SIZE):
+                detector.feed(raw[pos:pos + DETECT_CHUNK_SIZE])
+                if detector.done:
+                    break
+            result = detector.close()
         encoding = result.get('encoding')
-        confidence = result.get('confidence', 0)
+        confidence = result.get('confidence') or 0
         
         # 信頼度が低い場合や検出できない場合はバイナリ扱い
         if not encoding or confidence < 0.5:
             return False, None
         
-        # 実際に読めるか確認
+        # 実際に読めるか確認（先頭バッファの末尾で切れたマルチバイト文字は許容）
         try:
-            raw.decode(encoding)
+            codecs.getincrementaldecoder(encoding)().decode(raw, final=False)
             return True, encoding
         except (UnicodeDecodeError, LookupError):
             return False, None
@@ -50,35 +158,52 @@ def is_text_file(file_path) -> Tuple[bool, Optional[str]]:
         return False, None
 
 
-def get_mime_type(file_path) -> Optional[str]:
+def get_mime_type(file_path, head: Optional[bytes] = None) -> Optional[str]:
     """
     ファイルのMIMEタイプを取得する
     
+    先頭 MIME_HEAD_SIZE バイトだけをlibmagicに渡して判定し、結果を
+    (パス, 更新日時, サイズ) をキーにキャッシュする。ファイルが変更されれば
+    キーが変わるため再判定される。
+    
     Args:
         file_path: 対象ファイルのパス
+        head: read_head() で読み込み済みの先頭バイト列（Noneなら読み込む）
         
     Returns:
         MIMEタイプ文字列、またはNone
     """
-    if not _mime_detector:
+    detector = _get_mime_detector()
+    if not detector:
         return None
     try:
-        return _mime_detector.from_file(str(file_path))
+        st = os.stat(file_path)
+        key = (str(file_path), st.st_mtime_ns, st.st_size)
+        mime = _mime_cache.get(key)
+        if mime is None:
+            if head is None:
+                head = read_head(file_path, MIME_HEAD_SIZE)
+            mime = detector.from_buffer(head[:MIME_HEAD_SIZE])
+            if len(_mime_cache) >= MIME_CACHE_SIZE:
+                _mime_cache.clear()
+            _mime_cache[key] = mime
+        return mime
     except Exception:
         return None
 
 
-def is_likely_text_by_mime(file_path) -> Optional[bool]:
+def is_likely_text_by_mime(file_path, head: Optional[bytes] = None) -> Optional[bool]:
     """
     MIMEタイプからテキストファイルかどうか判定
     
     Args:
         file_path: 対象ファイルのパス
+        head: read_head() で読み込み済みの先頭バイト列（Noneなら読み込む）
         
     Returns:
         True/False/None（判定不可）
     """
-    mime = get_mime_type(file_path)
+    mime = get_mime_type(file_path, head)
     if mime is None:
         return None
     
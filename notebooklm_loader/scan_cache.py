@@ -0,0 +1,204 @@
+# notebooklm_loader/scan_cache.py
+"""ファイル判定結果の永続キャッシュモジュール"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# キャッシュファイル名（出力ディレクトリ直下）
+SCAN_CACHE_FILE = ".scan_cache.json"
+
+# キャッシュ形式のバージョン（判定方法を変えたら上げる）
+SCAN_CACHE_VERSION = 4
+
+
+class ScanCache:
+    """
+    ファイルごとの判定結果（テキスト判定・視覚密度）を実行間で再利用する
+
+    (ルートからの相対パス, 更新日時ns, サイズ) が一致するファイルは前回の判定結果を
+    そのまま使い、MIME判定・文字コード判定・MarkItDown変換前の密度判定を省略する。
+    ルート外のファイル（アーカイブの展開先など）はキャッシュしない。
+    出力PDFごとに元ファイルの (相対パス, 更新日時ns, サイズ) も記録し、同じ元ファイルから
+    出力したPDFだけを再利用できるようにする。
+    get/put/reusable_output はワーカースレッドから呼ばれ、claim_output・record_output・save は
+    メインスレッドで行う。
+
+    Attributes:
+        root: 処理対象のルートパス
+        entries: {相対パス: 判定結果} の辞書
+        outputs: {出力ファイル名: [元ファイルの相対パス, 更新日時ns, サイズ]} の辞書
+    """
+
+    def __init__(self, root: Path, entries: Optional[Dict[str, Dict[str, Any]]] = None,
+                 outputs: Optional[Dict[str, List[Any]]] = None):
+        self.root = str(root)
+        self.entries = entries or {}
+        self.outputs = outputs or {}
+        self._seen = set()
+        self._dirty = False
+        self._stats: Dict[str, Tuple[int, int]] = {}  # get で取得した (mtime_ns, size)
+        # 今回の実行で使う出力名 -> 元ファイルの識別情報（複数のファイルが使う・ルート外ならNone）
+        self._claims: Dict[str, Optional[List[Any]]] = {}
+
+    @classmethod
+    def load(cls, cache_file: Path, root: Path) -> 'ScanCache':
+        """
+        キャッシュファイルから読み込む（存在しない・壊れている場合は空）
+
+        Args:
+            cache_file: キャッシュファイルのパス
+            root: 処理対象のルートパス
+
+        Returns:
+            ScanCache インスタンス
+        """
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == SCAN_CACHE_VERSION:
+                return cls(root, data.get('entries', {}), data.get('outputs', {}))
+        except (OSError, ValueError):
+            pass
+        return cls(root)
+
+    def _key(self, file_path: Path) -> Optional[str]:
+        """キャッシュのキー（ルートからの相対パス）。ルート外ならNone"""
+        path = str(file_path)
+        if not path.startswith(self.root + os.sep):
+            return None
+        return path[len(self.root) + 1:]
+
+    def _identity(self, file_path: Path) -> Optional[List[Any]]:
+        """元ファイルの識別情報 [相対パス, 更新日時ns, サイズ]。ルート外ならNone"""
+        key = self._key(file_path)
+        if key is None:
+            return None
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return [key, st.st_mtime_ns, st.st_size]
+
+    def get(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        前回から変更されていないファイルの判定結果を返す
+
+        Args:
+            file_path: 対象ファイルのパス
+
+        Returns:
+            判定結果の辞書、キャッシュがない・ファイルが変更された場合はNone
+        """
+        key = self._key(file_path)
+        if key is None:
+            return None
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        # 直後の put で再度 stat しないよう記録しておく
+        self._stats[key] = (st.st_mtime_ns, st.st_size)
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry.get('mtime_ns') != st.st_mtime_ns or entry.get('size') != st.st_size:
+            return None
+        self._seen.add(key)
+        return entry
+
+    def put(self, file_path: Path, **decision):
+        """
+        判定結果を記録する
+
+        Args:
+            file_path: 対象ファイルのパス
+            **decision: 記録する判定結果（JSONに変換できる値）
+        """
+        key = self._key(file_path)
+        if key is None:
+            return
+        stat = self._stats.pop(key, None)
+        if stat is None:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return
+            stat = (st.st_mtime_ns, st.st_size)
+        mtime_ns, size = stat
+        entry = dict(self.entries.get(key) or {})
+        if entry.get('mtime_ns') != mtime_ns or entry.get('size') != size:
+            entry = {'mtime_ns': mtime_ns, 'size': size}
+        entry.update(decision)
+        self.entries[key] = entry
+        self._seen.add(key)
+        self._dirty = True
+
+    def claim_output(self, output_name: str, file_path: Path):
+        """
+        出力ファイル名を今回の実行で使うことを記録する
+
+        走査順に呼ぶ。今回の実行で複数のファイルが使う出力名は再利用せず、
+        その出力名の記録は次回以降も使わない。
+
+        Args:
+            output_name: 出力ファイル名
+            file_path: 元ファイルのパス
+        """
+        if output_name in self._claims:
+            self._claims[output_name] = None
+        else:
+            self._claims[output_name] = self._identity(file_path)
+
+    def reusable_output(self, output_name: str) -> bool:
+        """
+        claim_output した出力ファイル名の既存の出力を再利用できるか返す
+
+        前回同じ元ファイル（相対パス・更新日時・サイズが一致）から出力したものだけを
+        再利用できる。
+
+        Args:
+            output_name: 出力ファイル名
+
+        Returns:
+            既存の出力を再利用できる場合True
+        """
+        identity = self._claims.get(output_name)
+        return identity is not None and self.outputs.get(output_name) == identity
+
+    def record_output(self, output_name: str):
+        """
+        claim_output した出力ファイル名の書き出し（または再利用）の完了を記録する
+
+        Args:
+            output_name: 出力ファイル名
+        """
+        if output_name not in self._claims:
+            return
+        identity = self._claims[output_name]
+        if identity is None:
+            if self.outputs.pop(output_name, None) is not None:
+                self._dirty = True
+        elif self.outputs.get(output_name) != identity:
+            self.outputs[output_name] = identity
+            self._dirty = True
+
+    def save(self, cache_file: Path):
+        """
+        今回参照・記録したファイル（出力ファイル名）の分だけをキャッシュファイルに保存する
+
+        一時ファイルに書き出してから置き換えるため、途中で中断しても壊れない。
+
+        Args:
+            cache_file: キャッシュファイルのパス
+        """
+        outputs = {name: self.outputs[name] for name in self._claims if name in self.outputs}
+        if not self._dirty and len(self._seen) == len(self.entries) and len(outputs) == len(self.outputs):
+            return
+        entries = {key: self.entries[key] for key in self._seen if key in self.entries}
+        tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': SCAN_CACHE_VERSION, 'entries': entries, 'outputs': outputs},
+                      f, ensure_ascii=False)
+        os.replace(tmp_file, cache_file)
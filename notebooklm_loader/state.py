@@ -3,11 +3,15 @@
 
 import json
 import hashlib
+import os
 from pathlib import Path
 from typing import Dict, Optional, Any
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 
+# ハッシュ計算時の読み込み単位（1MB）
+HASH_BUFFER_SIZE = 1 << 20
+
 
 @dataclass
 class FileState:
@@ -40,9 +44,6 @@ class ProcessingState:
         Returns:
             ProcessingState インスタンス
         """
-        if not state_file.exists():
-            return cls()
-        
         try:
             with open(state_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -79,9 +80,17 @@ class ProcessingState:
         """
         sha256 = hashlib.sha256()
         try:
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(8192), b''):
-                    sha256.update(chunk)
+            # 同じバッファに1MBずつ読み込み、先読みを促すため順次アクセスであることをカーネルに伝える
+            with open(file_path, 'rb', buffering=0) as f:
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                buf = bytearray(HASH_BUFFER_SIZE)
+                view = memoryview(buf)
+                while True:
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    sha256.update(view[:n])
             return sha256.hexdigest()
         except Exception:
             return ""
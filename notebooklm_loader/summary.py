@@ -3,12 +3,12 @@
 
 import datetime
 import json
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, asdict
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, List
 
 
-@dataclass
+@dataclass(slots=True)
 class FileResult:
     """
     個別ファイルの処理結果
@@ -27,11 +27,13 @@ class FileResult:
     file_type: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingSummary:
     """
     処理サマリー
     
+    ファイル別の処理結果は FileResult のまま保持し、辞書への変換は save() 時にのみ行う。
+    
     Attributes:
         run_time: 実行時刻
         target_path: 処理対象パス
@@ -49,11 +51,11 @@ class ProcessingSummary:
     skipped: int = 0
     errors: int = 0
     password_protected: int = 0
-    files: List[Dict[str, Any]] = field(default_factory=list)
+    files: List[FileResult] = field(default_factory=list)
     
     def add_result(self, result: FileResult):
         """処理結果を追加"""
-        self.files.append(asdict(result))
+        self.files.append(result)
         self.total_files += 1
         
         if result.status == "converted":
@@ -65,17 +67,28 @@ class ProcessingSummary:
         elif result.status == "password_protected":
             self.password_protected += 1
     
-    def save(self, output_dir: Path) -> Path:
+    def save(self, output_dir: Path, pretty: bool = False) -> Path:
         """
         サマリーをJSONファイルに保存
         
+        asdict() はファイル別結果リスト全体をディープコピーするため使わず、
+        フィールドを浅く辞書にまとめ、ファイル別結果だけを辞書に変換してエンコードする。
+        整形（インデント）はサイズとエンコード時間が増えるため、指定時のみ行う。
+        
         Args:
             output_dir: 出力ディレクトリ
+            pretty: インデント付きで出力するか
             
         Returns:
             保存したファイルのパス
         """
         summary_file = output_dir / "processing_report.json"
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data['files'] = [asdict(result) for result in self.files]
         with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
+            if pretty:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            else:
+                # インデントなしなら1回の呼び出しでCエンコーダーが使われる
+                f.write(json.dumps(data, ensure_ascii=False))
         return summary_file
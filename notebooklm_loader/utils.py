@@ -3,9 +3,26 @@
 
 import os
 import re
+import shutil
+import threading
+from functools import lru_cache
 from pathlib import Path
+from typing import Callable, Optional
 
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
 
+# Linuxのreflink（ファイル全体のCoW複製）用ioctl番号（linux/fs.h の FICLONE）
+FICLONE = 0x40049409
+
+# ファイル名に使えない文字
+_SANITIZE_RE = re.compile(r'[\\/*?:"<>|]')
+
+
+@lru_cache(maxsize=4096)
 def sanitize_filename(name: str) -> str:
     """
     ファイル名として使える文字だけに置換
@@ -16,7 +33,7 @@ def sanitize_filename(name: str) -> str:
     Returns:
         サニタイズされたファイル名
     """
-    return re.sub(r'[\\/*?:"<>|]', "", name)
+    return _SANITIZE_RE.sub("", name)
 
 
 def get_output_filename(root_path: Path, file_path: Path, extension: str = ".md") -> str:
@@ -39,6 +56,149 @@ def get_output_filename(root_path: Path, file_path: Path, extension: str = ".md"
         return file_path.stem + extension
 
 
+def make_output_namer(root_path: Path) -> Callable[..., str]:
+    """
+    ルートパスを固定した get_output_filename 相当の関数を生成する
+    
+    1回の実行中はルートパスが変わらないため、ルートのパス要素を事前に
+    取り出しておき、ファイルごとの relative_to 計算を省略する。
+    
+    Args:
+        root_path: ルートパス
+        
+    Returns:
+        namer(file_path, extension=".md") -> フラット化されたファイル名
+    """
+    root_parts = root_path.parts
+    root_len = len(root_parts)
+    
+    def namer(file_path: Path, extension: str = ".md") -> str:
+        parts = file_path.parts
+        if len(parts) <= root_len or parts[:root_len] != root_parts:
+            return file_path.stem + extension
+        flat_name = "_".join(parts[root_len:-1] + (file_path.stem,))
+        return sanitize_filename(flat_name) + extension
+    
+    return namer
+
+
+def relative_path_str(root_path: Path, file_path: Path) -> Optional[str]:
+    """
+    ルートパスからの相対パス文字列を求める（str(file_path.relative_to(root_path)) 相当）
+    
+    Pathが保持するパス要素の比較だけで求め、relative_to の新しいPathの生成を省略する。
+    
+    Args:
+        root_path: ルートパス
+        file_path: ファイルパス
+        
+    Returns:
+        相対パス文字列、ルート外のファイルならNone
+    """
+    root_parts = root_path.parts
+    root_len = len(root_parts)
+    parts = file_path.parts
+    if len(parts) <= root_len or parts[:root_len] != root_parts:
+        return None
+    return os.sep.join(parts[root_len:])
+
+
+def fast_copy(src: Path, dst: Path) -> None:
+    """
+    ファイルをコピーする（shutil.copy2 相当）
+    
+    Linuxではまず ioctl(FICLONE) でreflink（Btrfs/XFS等でのCoW複製、データは
+    コピーしない）を試み、次に os.copy_file_range でカーネル内コピーを行う。
+    どちらもデータをユーザー空間に経由させない。
+    利用できない環境や失敗時は shutil.copyfile にフォールバックする。
+    タイムスタンプ等のメタデータは copy2 と同様に引き継ぐ。
+    
+    Args:
+        src: コピー元パス
+        dst: コピー先パス
+    """
+    copied = False
+    if HAS_FCNTL and hasattr(os, "copy_file_range"):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                try:
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                    remaining = 0
+                except OSError:
+                    # reflink非対応のFS（ext4等）や異なるFS間
+                    remaining = os.fstat(fsrc.fileno()).st_size
+                    while remaining > 0:
+                        n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                        if n == 0:
+                            break
+                        remaining -= n
+            copied = remaining == 0
+        except OSError:
+            copied = False  # 異なるFS間や非対応FSの場合は通常コピーへ
+    if not copied:
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+
+# link_or_copy のモード
+LINK_MODES = ("hardlink", "symlink", "copy")
+
+
+def _make_link(src: Path, dst: Path, mode: str) -> None:
+    """ハードリンクまたは相対パスのシンボリックリンクを作成する"""
+    if mode == "symlink":
+        os.symlink(os.path.relpath(src, os.path.dirname(dst)), dst)
+    else:
+        os.link(src, dst)
+
+
+def link_or_copy(src: Path, dst: Path, mode: str = "hardlink") -> None:
+    """
+    ハードリンク（またはシンボリックリンク）を作成し、できない場合はコピーする
+    
+    出力ディレクトリとマージディレクトリは同じFS上にあるため、
+    同じPDFを二重に書き込まずリンクで共有する。
+    既存のdst（前回実行時の出力）は、同じディレクトリの一時ファイルとして作ったリンク・コピーで
+    os.replace により置き換える（dstが存在しない瞬間がなく、既存のリンク越しにリンク元を上書きしない）。
+    
+    Args:
+        src: リンク元パス
+        dst: リンク先パス
+        mode: "hardlink" / "symlink" / "copy"（copyなら常にコピー）
+    """
+    if mode != "copy":
+        try:
+            _make_link(src, dst, mode)
+            return
+        except FileExistsError:
+            try:
+                # 前回実行時のハードリンクがそのまま残っている場合は何もしない
+                # （同じファイルへのリンク同士の os.replace は一時ファイルを残すため）
+                if mode == "hardlink" and os.path.samefile(src, dst):
+                    return
+                _replace_with(dst, lambda tmp: _make_link(src, tmp, mode))
+                return
+            except OSError:
+                pass
+        except OSError:
+            pass
+    _replace_with(dst, lambda tmp: fast_copy(src, tmp))
+
+
+def _replace_with(dst: Path, create: Callable[[Path], None]) -> None:
+    """一時ファイルを作成してdstを置き換える（失敗時は一時ファイルを削除する）"""
+    tmp = dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        create(tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
 # 除去対象の不可視文字（NotebookLMで問題を起こす可能性のある文字）
 INVISIBLE_CHARS = {
     '\u200b',  # Zero Width Space
@@ -65,8 +225,9 @@ def sanitize_content(content: str) -> str:
     Returns:
         不可視文字を除去したコンテンツ
     """
-    # 不可視文字を除去
+    # 不可視文字を除去（含まれない文字は置換しない。replaceは一致がなくても文字列全体を走査・複製する）
     for char in INVISIBLE_CHARS:
-        content = content.replace(char, '')
+        if char in content:
+            content = content.replace(char, '')
     
     return content
@@ -0,0 +1,89 @@
+# notebooklm_loader/writer.py
+"""出力ファイルの非同期書き込みモジュール"""
+
+import queue
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Optional, Sequence, Tuple, Union
+
+from .logger import get_logger
+from .summary import FileResult
+
+
+def write_output(output_path: Path, data: Union[bytes, Sequence[bytes]], result: FileResult) -> FileResult:
+    """
+    出力ファイルを書き込む
+    
+    Args:
+        output_path: 出力先パス
+        data: 書き込むバイト列、またはバイト列の並び（連結せずに順に書き込む）
+        result: 書き込み成功時の処理結果
+        
+    Returns:
+        処理結果（書き込み失敗時はerror）
+    """
+    try:
+        with open(output_path, 'wb') as f:
+            if isinstance(data, bytes):
+                f.write(data)
+            else:
+                f.writelines(data)
+    except Exception as e:
+        get_logger().error(f"Failed to write {output_path}: {e}")
+        return FileResult(path=result.path, status="error", error_message=str(e), file_type=result.file_type)
+    return result
+
+
+class BackgroundWriter:
+    """
+    個別出力ファイルの書き込みを専用スレッドで行う
+    
+    変換処理（CPU）とディスク書き込み（I/O）を重ねるため、書き込み要求を
+    キューに積んで1本のライタースレッドで順番に処理する。
+    write() はGILを解放するため、ライタースレッドは1本で十分。
+    要求は submit した順に書き込むため、同じ出力先への書き込みは後の要求の内容が残る。
+    処理結果（FileResult）はライタースレッドで確定し、submit が返すFutureで受け取る。
+    """
+
+    def __init__(self, max_pending: int = 64):
+        """
+        初期化
+        
+        Args:
+            max_pending: キューに積める書き込み要求の最大数（メモリ使用量の上限）
+        """
+        self._queue: "queue.Queue[Optional[Tuple[Path, Union[bytes, Sequence[bytes]], FileResult, Future]]]" = \
+            queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._writer_loop, name="notebooklm-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, output_path: Path, data: Union[bytes, Sequence[bytes]], result: FileResult) -> "Future[FileResult]":
+        """
+        書き込み要求を追加する
+        
+        Args:
+            output_path: 出力先パス
+            data: 書き込むバイト列、またはバイト列の並び（連結せずに順に書き込む）
+            result: 書き込み成功時に記録する処理結果
+            
+        Returns:
+            書き込み後の処理結果（書き込み失敗時はerror）を受け取るFuture
+        """
+        future: "Future[FileResult]" = Future()
+        self._queue.put((output_path, data, result, future))
+        return future
+
+    def _writer_loop(self):
+        """キューから書き込み要求を取り出して処理する"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            output_path, data, result, future = item
+            future.set_result(write_output(output_path, data, result))
+
+    def close(self):
+        """残りの書き込みを完了させてスレッドを終了する"""
+        self._queue.put(None)
+        self._thread.join()
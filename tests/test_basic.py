@@ -14,3 +14,17 @@ def test_merger_import():
     """Test that MergedOutputManager can be imported"""
     from notebooklm_loader.merger import MergedOutputManager
     assert MergedOutputManager is not None
+
+
+def test_run_processes_plain_file(tmp_path, monkeypatch):
+    """Test that a plain text file in the target directory is actually converted"""
+    import sys
+    from notebooklm_loader.main import run
+    target = tmp_path / "docs"
+    target.mkdir()
+    (target / "note.txt").write_text("hello world\n", encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["office_to_notebooklm.py", str(target), "-q"])
+
+    assert run() == 0
+    output = target / "converted_files" / "note.md"
+    assert "hello world" in output.read_text(encoding="utf-8")
@@ -0,0 +1,23 @@
+"""configモジュールのユニットテスト"""
+
+from notebooklm_loader.config import Config
+
+
+class TestExtensionMap:
+    """Config.extension_map のテスト"""
+
+    def test_categories(self):
+        """拡張子ごとに処理カテゴリが引けること"""
+        ext_map = Config().extension_map
+        assert ext_map['.docx'] == 'office_new'
+        assert ext_map['.pdf'] == 'pdf'
+        assert ext_map['.zip'] == 'archive'
+        assert ext_map.get('.unknown') is None
+
+    def test_priority(self):
+        """複数のセットに含まれる拡張子は優先順位の高いカテゴリになること"""
+        config = Config()
+        config.text_extensions = config.text_extensions | {'.docx'}
+        config.skip_extensions = config.skip_extensions | {'.zip'}
+        assert config.extension_map['.docx'] == 'office_new'
+        assert config.extension_map['.zip'] == 'skip'
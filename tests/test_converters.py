@@ -0,0 +1,219 @@
+"""convertersモジュールのユニットテスト"""
+
+import logging
+import os
+import sys
+
+import pytest
+from notebooklm_loader.converters import analyze_markdown, convert_batch_via_libreoffice
+
+
+class TestAnalyzeMarkdown:
+    """analyze_markdown関数のテスト"""
+    
+    def test_counts_image_references(self):
+        """画像参照の数を視覚要素として数えること"""
+        content = "# Title\n\n![red.png](Picture2.jpg)\n\ntext\n\n![](data:image/png;base64...)"
+        visual_count, _ = analyze_markdown(content)
+        assert visual_count == 2
+    
+    def test_excludes_image_references_from_char_count(self):
+        """画像参照を文字数に含めないこと"""
+        content = "hello\n\n![alt](Picture1.jpg)\n\nbye"
+        _, char_count = analyze_markdown(content)
+        assert char_count == len("hello\n\n\n\nbye")
+    
+    def test_text_only(self):
+        """画像のないテキスト"""
+        assert analyze_markdown("これは日本語テキストです。") == (0, len("これは日本語テキストです。"))
+    
+    def test_empty_string(self):
+        """空文字列を正しく処理すること"""
+        assert analyze_markdown("") == (0, 0)
+
+
+class TestEstimateOfficeDensity:
+    """estimate_office_density関数のテスト"""
+    
+    @pytest.fixture
+    def image_path(self, tmp_path):
+        """テスト用の画像ファイルを作成"""
+        from PIL import Image
+        path = tmp_path / "red.png"
+        Image.new('RGB', (10, 10), 'red').save(path)
+        return path
+    
+    def test_invalid_file(self, tmp_path):
+        """不正なファイルは (0, 0) を返すこと"""
+        from notebooklm_loader.converters import estimate_office_density
+        path = tmp_path / "broken.docx"
+        path.write_bytes(b"not a zip")
+        assert estimate_office_density(path) == (0, 0)
+    
+    def test_estimate_office_density(self, tmp_path, image_path):
+        """メディアエントリ数を視覚要素数として概算すること"""
+        import docx
+        from notebooklm_loader.converters import estimate_office_density
+        doc = docx.Document()
+        doc.add_paragraph("hello")
+        doc.add_picture(str(image_path))
+        path = tmp_path / "test.docx"
+        doc.save(path)
+        
+        visual_count, char_count = estimate_office_density(path)
+        assert visual_count == 1
+        assert char_count > 0
+
+    def test_estimate_ignores_header_images(self, tmp_path, image_path):
+        """ヘッダー・フッターの画像は視覚要素として数えないこと"""
+        import docx
+        from notebooklm_loader.converters import estimate_office_density
+        doc = docx.Document()
+        doc.sections[0].header.paragraphs[0].add_run().add_picture(str(image_path))
+        doc.add_paragraph("hello")
+        path = tmp_path / "logo.docx"
+        doc.save(path)
+        
+        visual_count, _ = estimate_office_density(path)
+        assert visual_count == 0
+    
+    def test_estimate_ignores_template_images(self, tmp_path):
+        """スライドマスター・レイアウトの画像は視覚要素として数えないこと"""
+        import zipfile
+        from notebooklm_loader.converters import estimate_office_density
+        image_rel = ('<Relationships><Relationship Id="rId1" Target="../media/image{0}.png" Type='
+                     '"http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"/>'
+                     '</Relationships>')
+        path = tmp_path / "deck.pptx"
+        with zipfile.ZipFile(path, "w") as z:
+            for i in range(6):
+                z.writestr(f"ppt/media/image{i}.png", b"png")
+                z.writestr(f"ppt/slideLayouts/_rels/slideLayout{i}.xml.rels", image_rel.format(i))
+            z.writestr("ppt/slides/slide1.xml", "<p:sld/>")
+            z.writestr("ppt/slides/_rels/slide1.xml.rels", image_rel.format(0))
+        
+        visual_count, _ = estimate_office_density(path)
+        assert visual_count == 1
+
+    def test_estimate_counts_xlsx_charts(self, tmp_path):
+        """Excelのグラフを視覚要素として数えること"""
+        import openpyxl
+        from openpyxl.chart import BarChart, Reference
+        from notebooklm_loader.converters import estimate_office_density
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(["value"])
+        ws.append([12])
+        for anchor in ("C2", "C20"):
+            chart = BarChart()
+            chart.add_data(Reference(ws, min_col=1, min_row=1, max_row=2))
+            ws.add_chart(chart, anchor)
+        path = tmp_path / "charts.xlsx"
+        wb.save(path)
+        
+        visual_count, _ = estimate_office_density(path)
+        assert visual_count == 2
+
+
+FAKE_SOFFICE = """#!/usr/bin/env python3
+import os, sys
+args = sys.argv[1:]
+with open(os.path.join(os.path.dirname(sys.argv[0]), "calls.log"), "a") as f:
+    f.write("\\n")
+outdir = args[args.index("--outdir") + 1]
+for p in args[args.index("--outdir") + 2:]:
+    if "broken" not in p:
+        open(os.path.join(outdir, os.path.splitext(os.path.basename(p))[0] + ".pdf"), "wb").write(b"%PDF")
+"""
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires POSIX shebang scripts")
+class TestConvertBatchViaLibreOffice:
+    """convert_batch_via_libreoffice関数のテスト"""
+    
+    @pytest.fixture
+    def fake_soffice(self, tmp_path, monkeypatch):
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        script = bin_dir / "soffice"
+        script.write_text(FAKE_SOFFICE)
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+        return bin_dir / "calls.log"
+    
+    def test_single_invocation(self, tmp_path, fake_soffice):
+        """複数ファイルを1回の起動で変換すること"""
+        inputs = [tmp_path / f"doc{i}.docx" for i in range(5)]
+        for p in inputs:
+            p.write_bytes(b"x")
+        results = convert_batch_via_libreoffice(inputs, tmp_path)
+        assert results == [tmp_path / f"doc{i}.pdf" for i in range(5)]
+        assert len(fake_soffice.read_text().splitlines()) == 1
+    
+    def test_failed_files_are_none(self, tmp_path, fake_soffice, monkeypatch):
+        """変換できなかったファイルはNoneになり、それだけがリトライされること"""
+        monkeypatch.setattr("time.sleep", lambda _: None)
+        inputs = [tmp_path / "ok.docx", tmp_path / "broken.docx"]
+        for p in inputs:
+            p.write_bytes(b"x")
+        results = convert_batch_via_libreoffice(inputs, tmp_path, max_retries=2)
+        assert results == [tmp_path / "ok.pdf", None]
+        assert len(fake_soffice.read_text().splitlines()) == 2
+    
+    def test_error_log_uses_display_names(self, tmp_path, fake_soffice, monkeypatch, caplog):
+        """変換エラーのログには入力の代わりに指定した名前を出すこと"""
+        monkeypatch.setattr("time.sleep", lambda _: None)
+        inputs = [tmp_path / "0000.docx", tmp_path / "broken.docx"]
+        for p in inputs:
+            p.write_bytes(b"x")
+        with caplog.at_level(logging.WARNING, logger="notebooklm_loader"):
+            convert_batch_via_libreoffice(inputs, tmp_path, max_retries=1,
+                                          display_names=["report.docx", "original.docx"])
+        assert "original.docx" in caplog.text
+        assert "broken.docx" not in caplog.text
+
+
+class TestConvertImageToPdf:
+    """convert_image_to_pdf関数のテスト"""
+    
+    def _page(self, pdf_path):
+        from PIL import PdfParser
+        pdf = PdfParser.PdfParser(str(pdf_path))
+        try:
+            page = pdf.read_indirect(pdf.pages[0])
+            image = pdf.read_indirect(page[b"Resources"][b"XObject"][b"image"])
+            return len(pdf.pages), list(page[b"MediaBox"]), image
+        finally:
+            pdf.close()
+    
+    def test_jpeg_embedded_without_reencoding(self, tmp_path):
+        """JPEGは元のデータをそのまま埋め込み、Pillowで保存した場合と同じページサイズになること"""
+        from PIL import Image
+        from notebooklm_loader.converters import convert_image_to_pdf
+        src = tmp_path / "photo.jpg"
+        Image.new("RGB", (300, 200), (200, 30, 30)).save(src, quality=90)
+        out_dir = tmp_path / "out"
+        out_dir.mkdir()
+        
+        result = convert_image_to_pdf(src, out_dir)
+        
+        assert result == out_dir / "photo.pdf"
+        assert src.read_bytes() in result.read_bytes()
+        pages, media_box, image = self._page(result)
+        assert pages == 1
+        assert media_box == [0, 0, 216, 144]
+        assert image.dictionary[b"Filter"] == b"DCTDecode"
+        assert image.buf == src.read_bytes()
+    
+    def test_png_converted_with_pillow(self, tmp_path):
+        """JPEG以外の画像はPillowでPDFに変換すること"""
+        from PIL import Image
+        from notebooklm_loader.converters import convert_image_to_pdf
+        src = tmp_path / "icon.png"
+        Image.new("RGBA", (30, 20), (0, 0, 255, 128)).save(src)
+        
+        result = convert_image_to_pdf(src, tmp_path)
+        
+        pages, media_box, _ = self._page(result)
+        assert pages == 1
+        assert [float(v) for v in media_box] == [0, 0, 21.6, 14.4]
@@ -0,0 +1,91 @@
+"""extractorsモジュールのユニットテスト"""
+
+import gzip
+import io
+import tarfile
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+from notebooklm_loader.extractors import archive_extractor
+from notebooklm_loader.extractors import extract_tar, extract_zip_with_encoding
+
+
+def _make_tar(path, files, mode="w:gz"):
+    """{名前: 内容} からtarファイルを作成"""
+    with tarfile.open(path, mode) as tf:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+
+
+class TestExtractTar:
+    """extract_tar関数のテスト"""
+
+    def test_extract_tar_gz(self, tmp_path):
+        """tar.gzを展開し、展開先の外を指すメンバーは展開しないこと"""
+        archive = tmp_path / "a.tar.gz"
+        _make_tar(archive, {"dir/a.txt": b"hello", "../evil.txt": b"x"})
+        out = tmp_path / "out"
+        out.mkdir()
+
+        assert extract_tar(archive, out) == "OK"
+        assert (out / "dir" / "a.txt").read_bytes() == b"hello"
+        assert not (tmp_path / "evil.txt").exists()
+
+    @pytest.mark.parametrize("compressed", [True, False])
+    def test_isal_stream(self, tmp_path, monkeypatch, compressed):
+        """isalが使える場合、gzip圧縮のtarだけをストリームとして伸長すること"""
+        opened = []
+
+        def fake_open(fileobj, mode, threads):
+            opened.append(threads)
+            return gzip.open(fileobj, mode)
+
+        monkeypatch.setattr(archive_extractor, "HAS_ISAL", True)
+        monkeypatch.setattr(archive_extractor, "igzip_threaded",
+                            SimpleNamespace(open=fake_open), raising=False)
+        archive = tmp_path / "a.tar"
+        _make_tar(archive, {"a.txt": b"hello", "b.txt": b"world"}, "w:gz" if compressed else "w")
+        out = tmp_path / "out"
+        out.mkdir()
+
+        assert extract_tar(archive, out) == "OK"
+        assert (out / "a.txt").read_bytes() == b"hello"
+        assert (out / "b.txt").read_bytes() == b"world"
+        assert opened == ([1] if compressed else [])
+
+
+class TestExtractZip:
+    """extract_zip_with_encoding関数のテスト"""
+
+    def test_extract_and_block_traversal(self, tmp_path):
+        """展開先の外（名前が展開先で始まる隣のディレクトリを含む）には展開しないこと"""
+        archive = tmp_path / "a.zip"
+        with zipfile.ZipFile(archive, "w") as z:
+            z.writestr("dir/", b"")
+            z.writestr("dir/a.txt", b"hello")
+            z.writestr("../out_evil/b.txt", b"x")
+            z.writestr("../evil.txt", b"x")
+        out = tmp_path / "out"
+        out.mkdir()
+
+        assert extract_zip_with_encoding(archive, out) == "OK"
+        assert (out / "dir" / "a.txt").read_bytes() == b"hello"
+        assert not (tmp_path / "out_evil").exists()
+        assert not (tmp_path / "evil.txt").exists()
+
+    def test_cp932_filename(self, tmp_path):
+        """UTF-8フラグのないShift-JISのファイル名を復元して展開すること"""
+        name = "資料.txt".encode("cp932")
+        placeholder = b"x" * len(name)
+        archive = tmp_path / "a.zip"
+        with zipfile.ZipFile(archive, "w") as z:
+            z.writestr(placeholder.decode("ascii"), b"hello")
+        archive.write_bytes(archive.read_bytes().replace(placeholder, name))
+        out = tmp_path / "out"
+        out.mkdir()
+
+        assert extract_zip_with_encoding(archive, out) == "OK"
+        assert (out / "資料.txt").read_bytes() == b"hello"
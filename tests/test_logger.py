@@ -0,0 +1,89 @@
+"""loggerモジュールのユニットテスト"""
+
+import logging
+import logging.handlers
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from notebooklm_loader.logger import get_logger, init_worker_logging, setup_logging, start_worker_log_listener
+
+
+def _log_warning(message):
+    get_logger().warning(message)
+
+
+class _ListHandler(logging.Handler):
+    """出力されたログをリストに記録するハンドラ"""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class TestWorkerLogging:
+    """ワーカープロセスのログ転送のテスト"""
+
+    def test_worker_logs_reach_main_handlers(self):
+        """ワーカープロセスのログがメインプロセスのハンドラで出力されること"""
+        logger = get_logger()
+        handler = _ListHandler()
+        saved = logger.handlers[:]
+        logger.handlers[:] = [handler]
+        try:
+            mp_context = multiprocessing.get_context("spawn")
+            log_queue = mp_context.Queue()
+            listener = start_worker_log_listener(log_queue)
+            with ProcessPoolExecutor(max_workers=1, mp_context=mp_context, initializer=init_worker_logging,
+                                     initargs=(log_queue, logging.INFO)) as pool:
+                pool.submit(_log_warning, "from worker").result()
+            listener.stop()
+        finally:
+            logger.handlers[:] = saved
+        
+        assert handler.messages == ["from worker"]
+
+
+class TestSetupLogging:
+    """setup_logging関数のテスト"""
+
+    def test_quiet_console(self, tmp_path):
+        """quiet指定時はコンソールにCRITICALのみ出力し、ログファイルには出力すること"""
+        logger = get_logger()
+        saved = logger.handlers[:]
+        logger.handlers[:] = []
+        try:
+            setup_logging(tmp_path, quiet=True)
+            console = [h for h in logger.handlers if isinstance(h, logging.StreamHandler)]
+            assert [h.level for h in console] == [logging.CRITICAL]
+            assert any(isinstance(h, logging.handlers.MemoryHandler) for h in logger.handlers)
+        finally:
+            for handler in logger.handlers:
+                target = getattr(handler, "target", None)
+                handler.close()
+                if target is not None:
+                    target.close()
+            logger.handlers[:] = saved
+
+    def test_file_log_is_buffered(self, tmp_path):
+        """INFOはまとめて書き出し、WARNING以上は即時にファイルへ書き出すこと"""
+        logger = get_logger()
+        saved = logger.handlers[:]
+        logger.handlers[:] = []
+        try:
+            setup_logging(tmp_path)
+            log_file = next((tmp_path / "logs").iterdir())
+            logger.info("buffered message")
+            assert "buffered message" not in log_file.read_text(encoding="utf-8")
+            logger.warning("urgent message")
+            text = log_file.read_text(encoding="utf-8")
+            assert "buffered message" in text and "urgent message" in text
+        finally:
+            for handler in logger.handlers:
+                target = getattr(handler, "target", None)
+                handler.close()
+                if target is not None:
+                    target.close()
+            logger.handlers[:] = saved
@@ -0,0 +1,374 @@
+"""mainモジュールのユニットテスト"""
+
+import os
+import random
+import threading
+import time
+from pathlib import Path
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from notebooklm_loader import main
+from notebooklm_loader.config import Config
+from notebooklm_loader.main import (
+    OUTPUT_DIR_NAME, _ArchivePrefetcher, _FileOutcome, _FileScheduler, _PdfRequest, _iter_files,
+    _process_single_file
+)
+from notebooklm_loader.scan_cache import SCAN_CACHE_FILE, ScanCache
+from notebooklm_loader.utils import make_output_namer
+from notebooklm_loader.summary import FileResult, ProcessingSummary
+from notebooklm_loader.writer import BackgroundWriter
+
+
+def _slow_outcome(i: int) -> _FileOutcome:
+    """ランダムな時間待ってから結果を返す"""
+    time.sleep(random.random() * 0.01)
+    return _FileOutcome(
+        results=[FileResult(path=f"file{i}", status="converted")],
+        report_items=[(f"file{i}", 0, 0, 0, "ok")],
+    )
+
+
+def _markdown_outcome(i: int, output_path: Path, n: int) -> _FileOutcome:
+    """先に投入したものほど遅く、同じ出力先への書き込み要求を返す"""
+    time.sleep((n - i) * 0.005)
+    return _FileOutcome(markdown_output=(output_path, (f"content {i}".encode(),),
+                                         FileResult(path=f"file{i}", status="converted", output=output_path.name)))
+
+
+def _pdf_outcome(i: int) -> _FileOutcome:
+    """PDF変換要求だけを持つ結果を返す"""
+    request = _PdfRequest(Path(f"doc{i}.docx"), f"doc{i}", ".docx", Path(f"doc{i}.pdf"))
+    return _FileOutcome(pdf_request=request)
+
+
+class TestFileScheduler:
+    """_FileScheduler クラスのテスト"""
+
+    @pytest.mark.parametrize("workers", [None, 4])
+    def test_applies_in_submission_order(self, workers):
+        """並列実行しても投入順に結果が反映されること"""
+        summary = ProcessingSummary()
+        report_items = []
+        executor = ThreadPoolExecutor(max_workers=workers) if workers else None
+        scheduler = _FileScheduler(executor, summary, report_items, None, max_pending=3)
+        for i in range(20):
+            scheduler.submit(_slow_outcome, i)
+        scheduler.drain()
+        if executor:
+            executor.shutdown()
+        
+        assert [f.path for f in summary.files] == [f"file{i}" for i in range(20)]
+        assert [item[0] for item in report_items] == [f"file{i}" for i in range(20)]
+        assert summary.processed == 20
+
+    @pytest.mark.parametrize("use_writer", [False, True])
+    def test_writes_in_submission_order(self, tmp_path, use_writer):
+        """出力名が衝突しても後に投入したファイルの内容が残り、結果は投入順に反映されること"""
+        summary = ProcessingSummary()
+        writer = BackgroundWriter() if use_writer else None
+        output_path = tmp_path / "same.md"
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            scheduler = _FileScheduler(executor, summary, [], None, max_pending=8, writer=writer)
+            for i in range(10):
+                scheduler.submit(_markdown_outcome, i, output_path, 10)
+                scheduler.add_result(FileResult(path=f"skip{i}", status="skipped"))
+            scheduler.drain()
+        if writer:
+            writer.close()
+        
+        assert output_path.read_text() == "content 9"
+        assert [f.path for f in summary.files] == [p for i in range(10) for p in (f"file{i}", f"skip{i}")]
+
+    def test_background_pdf_conversion_keeps_order(self, monkeypatch):
+        """逐次処理でPDF変換を別スレッドで行っても、後続の結果はPDF変換の結果の後に反映されること"""
+        def fake_convert(requests, isolated_profile):
+            time.sleep(0.05)
+            return [_FileOutcome(results=[FileResult(path=r.file, status="converted")]) for r in requests]
+        
+        monkeypatch.setattr(main, "PDF_BATCH_SIZE", 1)
+        monkeypatch.setattr(main, "_convert_pdf_batch", fake_convert)
+        summary = ProcessingSummary()
+        pdf_executor = ThreadPoolExecutor(max_workers=1)
+        scheduler = _FileScheduler(None, summary, [], None, max_pending=8, pdf_executor=pdf_executor)
+        scheduler.submit(_pdf_outcome, 0)
+        scheduler.submit(_slow_outcome, 1)
+        scheduler.drain()
+        pdf_executor.shutdown()
+        
+        assert [f.path for f in summary.files] == ["doc0", "file1"]
+
+    @pytest.mark.parametrize("workers", [None, 4])
+    def test_pdf_batch_does_not_block_following_files(self, monkeypatch, workers):
+        """PDF変換は件数がたまるのを待たずに始まり、変換中も後続のファイルの処理を止めないこと"""
+        release = threading.Event()
+        timed_out = []
+        
+        def fake_convert(requests, isolated_profile):
+            timed_out.append(not release.wait(5))
+            return [_FileOutcome(results=[FileResult(path=r.file, status="converted")]) for r in requests]
+        
+        monkeypatch.setattr(main, "_convert_pdf_batch", fake_convert)
+        summary = ProcessingSummary()
+        executor = ThreadPoolExecutor(max_workers=workers) if workers else None
+        pdf_executor = None if executor else ThreadPoolExecutor(max_workers=1)
+        scheduler = _FileScheduler(executor, summary, [], None, max_pending=2, pdf_executor=pdf_executor)
+        scheduler.submit(_pdf_outcome, 0)
+        for i in range(1, 10):
+            scheduler.submit(_slow_outcome, i)
+        release.set()
+        scheduler.drain()
+        for pool in (executor, pdf_executor):
+            if pool:
+                pool.shutdown()
+        
+        assert timed_out == [False]
+        assert [f.path for f in summary.files] == ["doc0"] + [f"file{i}" for i in range(1, 10)]
+
+
+class TestConvertPdfBatch:
+    """_convert_pdf_batch関数のテスト"""
+    
+    @pytest.fixture
+    def converted(self, monkeypatch):
+        """LibreOfficeでの変換を置き換え、ログ用に渡された名前を記録する"""
+        calls = []
+        
+        def fake_convert(input_paths, output_dir_path, isolated_profile=False, display_names=None):
+            calls.append(display_names)
+            for p in input_paths:
+                (output_dir_path / (p.stem + ".pdf")).write_bytes(b"%PDF")
+            return [output_dir_path / (p.stem + ".pdf") for p in input_paths]
+        
+        monkeypatch.setattr(main, "convert_batch_via_libreoffice", fake_convert)
+        return calls
+    
+    def test_staging_error_is_recorded(self, tmp_path, monkeypatch, converted):
+        """作業用ディレクトリに置けなかった要求はエラーとして記録し、残りは変換すること"""
+        def no_symlink(*args):
+            raise OSError("symlink not permitted")
+        
+        monkeypatch.setattr(os, "symlink", no_symlink)
+        ok = tmp_path / "ok.docx"
+        ok.write_bytes(b"x")
+        missing = tmp_path / "missing.docx"
+        requests = [_PdfRequest(path, path.name, ".docx", tmp_path / (path.stem + ".pdf")) for path in (missing, ok)]
+        
+        outcomes = main._convert_pdf_batch(requests, False)
+        
+        assert [r.status for r in outcomes[0].results] == ["error"]
+        assert outcomes[0].pdf_output is None
+        assert outcomes[1].pdf_output.result.status == "converted"
+        assert converted == [["ok.docx"]]
+    
+    def test_work_dir_error_is_recorded(self, tmp_path, converted):
+        """作業用ディレクトリを作れなければ、全要求をエラーとして記録すること"""
+        src = tmp_path / "a.docx"
+        src.write_bytes(b"x")
+        requests = [_PdfRequest(src, src.name, ".docx", tmp_path / "missing" / "a.pdf")]
+        
+        outcomes = main._convert_pdf_batch(requests, False)
+        
+        assert [r.status for r in outcomes[0].results] == ["error"]
+        assert converted == []
+
+
+class TestIterFiles:
+    """_iter_files関数のテスト"""
+    
+    def test_matches_os_walk(self, tmp_path):
+        """出力・隠しディレクトリを除いたos.walkと同じファイルを同じ順序で列挙すること"""
+        for d in ["a", "a/b", "c", OUTPUT_DIR_NAME, OUTPUT_DIR_NAME + "_merged", "c/d/e", ".git", "a/.cache"]:
+            (tmp_path / d).mkdir(parents=True)
+        for f in ["x.txt", "a/y.md", "a/b/z.csv", "c/d/e/w.docx", OUTPUT_DIR_NAME + "/out.md",
+                  OUTPUT_DIR_NAME + "_merged/Merged.md", ".git/config", "a/.cache/c.txt"]:
+            (tmp_path / f).write_text("x")
+        os.symlink(tmp_path / "a", tmp_path / "link_dir")
+        os.symlink(tmp_path / "x.txt", tmp_path / "c" / "link.txt")
+        
+        expected = []
+        for root, dirs, files in os.walk(tmp_path):
+            dirs[:] = [d for d in dirs if not d.startswith(".") and not d.startswith(OUTPUT_DIR_NAME)]
+            expected.extend(os.path.join(root, f) for f in files)
+        
+        assert [e.path for e in _iter_files(str(tmp_path))] == expected
+    
+    def test_target_path_containing_output_name(self, tmp_path):
+        """起点のパスに出力ディレクトリ名が含まれていても列挙すること"""
+        top = tmp_path / (OUTPUT_DIR_NAME + "_backup")
+        top.mkdir()
+        (top / "x.txt").write_text("x")
+        assert [e.name for e in _iter_files(str(top))] == ["x.txt"]
+
+
+class TestArchivePrefetcher:
+    """_ArchivePrefetcher クラスのテスト"""
+    
+    def _archives(self, tmp_path, n):
+        archives = []
+        for i in range(n):
+            path = tmp_path / f"a{i}.zip"
+            with zipfile.ZipFile(path, "w") as z:
+                z.writestr(f"f{i}.txt", f"content {i}")
+            archives.append((path, ".zip"))
+        return archives
+    
+    def test_extracts_ahead(self, tmp_path):
+        """先行展開した結果を受け取れ、未受け取りの一時ディレクトリは削除されること"""
+        archives = self._archives(tmp_path, 3)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            prefetcher = _ArchivePrefetcher(executor, archives, max_ahead=2)
+            result, temp_dir = prefetcher.take(archives[0][0]).result()
+            assert result == "OK"
+            assert os.listdir(temp_dir) == ["f0.txt"]
+            os.remove(os.path.join(temp_dir, "f0.txt"))
+            os.rmdir(temp_dir)
+            
+            _, leftover = prefetcher._futures[archives[1][0]].result()
+            prefetcher.close()
+            assert not os.path.exists(leftover)
+    
+    def test_sequential_does_not_prefetch(self, tmp_path):
+        """executorがNoneなら先行展開しないこと"""
+        archives = self._archives(tmp_path, 1)
+        prefetcher = _ArchivePrefetcher(None, archives, max_ahead=2)
+        assert prefetcher.take(archives[0][0]) is None
+
+
+class TestReusePdf:
+    """変換済みPDFの再利用のテスト"""
+    
+    def _run(self, tmp_path, config, sources, executor=None):
+        """1回の実行と同様に、キャッシュを読み込んでファイルを処理し、保存する"""
+        out = tmp_path / OUTPUT_DIR_NAME
+        merged = tmp_path / "merged"
+        out.mkdir(exist_ok=True)
+        merged.mkdir(exist_ok=True)
+        cache_file = out / SCAN_CACHE_FILE
+        scan_cache = ScanCache(tmp_path) if config.full_rebuild else ScanCache.load(cache_file, tmp_path)
+        summary = ProcessingSummary()
+        scheduler = _FileScheduler(executor, summary, [], None, scan_cache=scan_cache)
+        namer = make_output_namer(tmp_path)
+        for src in sources:
+            scan_cache.claim_output(namer(src, ".pdf"), src)
+            scheduler.submit(_process_single_file, src, src.name, ".png", tmp_path, out, config, merged,
+                             namer, None, scan_cache)
+        scheduler.drain()
+        scan_cache.save(cache_file)
+        return summary
+    
+    @pytest.fixture
+    def converted(self, monkeypatch, tmp_path):
+        """画像のPDF変換の呼び出しを記録する（PDFの内容は元ファイルの内容）"""
+        calls = []
+        
+        def fake_convert(file_path, out_dir):
+            calls.append(file_path)
+            if file_path.name == "x.png":
+                time.sleep(0.05)  # 並列時に先に投入したファイルの変換が後に終わるようにする
+            pdf = out_dir / (file_path.stem + ".pdf")
+            pdf.write_bytes(file_path.read_bytes())
+            return pdf
+        
+        monkeypatch.setattr(main, "convert_image_to_pdf", fake_convert)
+        (tmp_path / "pic.png").write_bytes(b"png")
+        return calls
+    
+    def test_skips_up_to_date_pdf(self, tmp_path, converted):
+        """同じ元ファイルから出力したPDFがあれば変換せず、マージディレクトリにも置くこと"""
+        src = tmp_path / "pic.png"
+        self._run(tmp_path, Config(), [src])
+        summary = self._run(tmp_path, Config(), [src])
+        
+        assert len(converted) == 1
+        assert [f.output for f in summary.files] == ["pic.pdf"]
+        assert (tmp_path / "merged" / "pic.pdf").exists()
+    
+    def test_reconverts_modified_source(self, tmp_path, converted):
+        """元ファイルが変更されていれば、出力PDFの方が新しくても変換し直すこと"""
+        src = tmp_path / "pic.png"
+        self._run(tmp_path, Config(), [src])
+        src.write_bytes(b"png2")
+        os.utime(src, ns=(0, 0))
+        self._run(tmp_path, Config(), [src])
+        
+        assert len(converted) == 2
+        assert (tmp_path / OUTPUT_DIR_NAME / "pic.pdf").read_bytes() == b"png2"
+    
+    def test_full_rebuild(self, tmp_path, converted):
+        """--full-rebuild 指定時は常に変換し直すこと"""
+        src = tmp_path / "pic.png"
+        self._run(tmp_path, Config(), [src])
+        self._run(tmp_path, Config(full_rebuild=True), [src])
+        assert len(converted) == 2
+    
+    def test_colliding_output_names(self, tmp_path, converted):
+        """出力名が衝突するファイルは再利用せず、毎回後のファイルの内容で上書きすること"""
+        first = tmp_path / "a_b" / "x.png"
+        second = tmp_path / "a" / "b_x.png"
+        for src in (first, second):
+            src.parent.mkdir()
+            src.write_bytes(str(src).encode())
+        output = tmp_path / OUTPUT_DIR_NAME / "a_b_x.pdf"
+        
+        self._run(tmp_path, Config(), [first, second])
+        assert output.read_bytes() == str(second).encode()
+        self._run(tmp_path, Config(), [first, second])
+        assert output.read_bytes() == str(second).encode()
+        # 前回どちらから出力したかにかかわらず、今回は1つ目のファイルだけなら作り直す
+        self._run(tmp_path, Config(), [first])
+        assert output.read_bytes() == str(first).encode()
+        assert len(converted) == 5
+    
+    def test_colliding_output_names_in_parallel(self, tmp_path, converted):
+        """並列に変換しても、出力名が衝突するファイルは後に投入したファイルの内容が残ること"""
+        first = tmp_path / "a_b" / "x.png"
+        second = tmp_path / "a" / "b_x.png"
+        for src in (first, second):
+            src.parent.mkdir()
+            src.write_bytes(str(src).encode())
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            summary = self._run(tmp_path, Config(), [first, second], executor)
+        
+        assert (tmp_path / OUTPUT_DIR_NAME / "a_b_x.pdf").read_bytes() == str(second).encode()
+        assert (tmp_path / "merged" / "a_b_x.pdf").read_bytes() == str(second).encode()
+        assert [f.path for f in summary.files] == [str(first), str(second)]
+        assert not [p for p in (tmp_path / OUTPUT_DIR_NAME).iterdir() if p.name.endswith(".tmp")]
+    
+    def test_outside_root_not_reused(self, tmp_path, converted):
+        """ルート外のファイル（アーカイブの展開先など）の出力は再利用しないこと"""
+        extracted = tmp_path.parent / (tmp_path.name + "_extracted")
+        extracted.mkdir()
+        src = extracted / "pic.png"
+        src.write_bytes(b"other")
+        self._run(tmp_path, Config(), [src])
+        self._run(tmp_path, Config(), [src])
+        assert len(converted) == 2
+
+
+class TestOfficeDensity:
+    """新形式Officeファイルの視覚密度判定のテスト"""
+    
+    def test_chart_only_xlsx_goes_to_pdf(self, tmp_path):
+        """グラフだけが視覚要素のExcelファイルもPDF化の対象になること"""
+        import openpyxl
+        from openpyxl.chart import BarChart, Reference
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.append(["value"])
+        ws.append([12])
+        chart = BarChart()
+        chart.add_data(Reference(ws, min_col=1, min_row=1, max_row=2))
+        ws.add_chart(chart, "C2")
+        src = tmp_path / "chart.xlsx"
+        wb.save(src)
+        out = tmp_path / OUTPUT_DIR_NAME
+        out.mkdir()
+        
+        outcome = _process_single_file(src, src.name, ".xlsx", tmp_path, out, Config(), None,
+                                       make_output_namer(tmp_path))
+        
+        assert outcome.pdf_request is not None
+        assert outcome.pdf_request.report_item.visuals == 1
@@ -68,6 +68,16 @@ class TestMergedOutputManager:
         assert "# Table of Contents" in content
         assert "test.md" in content
         assert "Test content" in content
+    
+    def test_chunks_joined_with_newline(self, temp_output_dir):
+        """チャンクが改行区切りで順番どおりに書き出されること"""
+        manager = MergedOutputManager(temp_output_dir, max_chars_per_volume=10000)
+        manager.add_content("a.md", "First")
+        manager.add_content("b.md", "Second")
+        manager.finalize()
+        
+        content = (temp_output_dir / "Merged_Files_Vol01.md").read_text(encoding='utf-8')
+        assert content == "# Table of Contents\n- a.md\n- b.md\n\n---\n\nFirst\nSecond"
 
 
 class TestHandleHugeFile:
@@ -174,3 +184,110 @@ class TestVolumeNumbering:
         for i, f in enumerate(output_files, 1):
             expected_name = f"Merged_Files_Vol{i:02d}.md"
             assert f.name == expected_name
+
+
+class TestByteBudget:
+    """バイト数上限のテスト"""
+    
+    @pytest.fixture
+    def temp_output_dir(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+    
+    def test_tracks_utf8_bytes(self, temp_output_dir):
+        """UTF-8のバイト数を記録すること"""
+        manager = MergedOutputManager(temp_output_dir, max_chars_per_volume=10000)
+        manager.add_content("jp.md", "日本語")
+        assert manager.current_char_count == 3
+        assert manager.current_byte_count == 9
+    
+    def test_flushes_on_byte_overflow(self, temp_output_dir):
+        """文字数が上限内でもバイト数超過でフラッシュされること"""
+        manager = MergedOutputManager(temp_output_dir, max_chars_per_volume=100, max_bytes_per_volume=150)
+        manager.add_content("a.md", "あ" * 30)  # 30文字 / 90バイト（目次込みで125バイト）
+        manager.add_content("b.md", "い" * 30)
+        
+        assert manager.current_vol == 2
+        assert (temp_output_dir / "Merged_Files_Vol01.md").exists()
+    
+    def test_splits_huge_file_by_bytes(self, temp_output_dir):
+        """バイト数上限を超える巨大ファイルが行単位で分割されること"""
+        manager = MergedOutputManager(temp_output_dir, max_chars_per_volume=10000, max_bytes_per_volume=200)
+        lines = [f"行{i:03d}" + "あ" * 10 for i in range(20)]
+        manager.add_content("huge.md", "\n".join(lines))
+        manager.finalize()
+        
+        output_files = sorted(temp_output_dir.glob("Merged_Files_Vol*.md"))
+        assert len(output_files) > 1
+        all_content = "".join(f.read_text(encoding='utf-8') for f in output_files)
+        for line in lines:
+            assert line in all_content
+
+
+class TestVolumeSizeAccounting:
+    """目次を含めたボリュームサイズ判定のテスト"""
+    
+    @pytest.fixture
+    def temp_output_dir(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+    
+    @pytest.mark.parametrize("max_bytes", [None, 400])
+    def test_volumes_never_exceed_limits(self, temp_output_dir, max_bytes):
+        """目次と区切りを含めてもボリュームが上限を超えないこと"""
+        manager = MergedOutputManager(temp_output_dir, max_chars_per_volume=300, max_bytes_per_volume=max_bytes)
+        for i in range(40):
+            manager.add_content(f"some/long/path/file_{i:03d}.md", "本文" * (i % 7 + 1))
+        manager.add_content("huge.md", "\n".join("行" * 20 for _ in range(30)))
+        manager.finalize()
+        
+        for f in temp_output_dir.glob("Merged_Files_Vol*.md"):
+            data = f.read_bytes()
+            assert len(data.decode('utf-8')) <= 300
+            if max_bytes is not None:
+                assert len(data) <= max_bytes
+    
+    def test_tracks_toc_overhead(self, temp_output_dir):
+        """目次と区切りの改行を含めた見積もりが実際のサイズ以上であること"""
+        manager = MergedOutputManager(temp_output_dir, max_chars_per_volume=10000)
+        manager.add_content("a.md", "First")
+        manager.add_content("b.md", "Second")
+        estimated = manager.current_char_count + manager.current_overhead_chars
+        manager.finalize()
+        
+        written = (temp_output_dir / "Merged_Files_Vol01.md").read_text(encoding='utf-8')
+        # 最後のエントリの区切り分だけ多めに見積もる
+        assert estimated == len(written) + 2
+
+    @pytest.mark.parametrize("max_chars", [10000, 120])
+    def test_content_parts_match_joined(self, tmp_path, max_chars):
+        """断片のシーケンスで追加しても、連結した文字列を追加した場合と同じ出力になること"""
+        parts = ("# header\n", "本文\n" * 20, "\n\n---\n\n")
+        for name, content in [("joined", "".join(parts)), ("parts", parts)]:
+            manager = MergedOutputManager(tmp_path / name, max_chars_per_volume=max_chars)
+            manager.add_content("a.md", content)
+            manager.add_content("b.md", content)
+            manager.finalize()
+        
+        joined = sorted((tmp_path / "joined").iterdir())
+        assert [f.name for f in joined] == [f.name for f in sorted((tmp_path / "parts").iterdir())]
+        for f in joined:
+            assert f.read_bytes() == (tmp_path / "parts" / f.name).read_bytes()
+
+    @pytest.mark.parametrize("max_chars", [10000, 120])
+    def test_add_encoded_matches_add_content(self, tmp_path, max_chars):
+        """エンコード済みバッファを追加しても、文字列を追加した場合と同じ出力になること"""
+        parts = ("# header\n", "本文\n" * 20, "\n\n---\n\n")
+        for name in ("str", "bytes"):
+            manager = MergedOutputManager(tmp_path / name, max_chars_per_volume=max_chars)
+            for filename in ("a.md", "b.md"):
+                if name == "str":
+                    manager.add_content(filename, parts)
+                else:
+                    manager.add_encoded(filename, [p.encode("utf-8") for p in parts], sum(map(len, parts)))
+            manager.finalize()
+        
+        expected = sorted((tmp_path / "str").iterdir())
+        assert [f.name for f in expected] == [f.name for f in sorted((tmp_path / "bytes").iterdir())]
+        for f in expected:
+            assert f.read_bytes() == (tmp_path / "bytes" / f.name).read_bytes()
@@ -0,0 +1,124 @@
+"""processorsモジュールのユニットテスト"""
+
+import os
+
+import pytest
+from notebooklm_loader.processors import file_processor
+from notebooklm_loader.processors import is_text_file, get_mime_type, read_head
+
+
+class _CountingDetector:
+    """from_buffer の呼び出し回数を数える偽のMIME判定器"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def from_buffer(self, buf):
+        self.calls += 1
+        return "text/plain"
+
+
+class TestIsTextFile:
+    """is_text_file関数のテスト"""
+
+    def test_uses_given_head(self, tmp_path):
+        """渡された先頭バイト列で判定すること"""
+        path = tmp_path / "a.txt"
+        path.write_bytes(b"\x00\x01\x02" * 100)
+        assert is_text_file(path, b"plain ascii text")[0] is True
+
+    def test_reads_head_when_missing(self, tmp_path):
+        """先頭バイト列が無ければファイルから読むこと"""
+        path = tmp_path / "a.txt"
+        path.write_text("hello world", encoding="utf-8")
+        assert is_text_file(path) == (True, "ascii")
+        assert read_head(path) == b"hello world"
+
+
+    def test_null_bytes_are_binary(self, tmp_path):
+        """先頭にNULバイトを含むファイルはバイナリと判定すること"""
+        path = tmp_path / "a.bin"
+        path.write_bytes(b"ELF\x00\x01\x02" + b"text" * 100)
+        assert is_text_file(path) == (False, None)
+
+    def test_null_byte_after_first_chunk_is_binary(self, tmp_path):
+        """先頭チャンクより後ろ（先頭4KB以内）のNULバイトでもバイナリと判定すること"""
+        path = tmp_path / "a.bin"
+        path.write_bytes(b"a" * 1000 + b"\x00" + b"b" * 100)
+        assert is_text_file(path) == (False, None)
+
+    def test_pdf_signature_skips_detector(self, tmp_path, monkeypatch):
+        """NULバイトを含まないPDFもシグネチャで文字コード判定器を使わずにバイナリと判定すること"""
+        def fail(*args, **kwargs):
+            raise AssertionError("detector should not be used")
+        monkeypatch.setattr(file_processor, "UniversalDetector", fail)
+        monkeypatch.setattr(file_processor, "HAS_CCHARDET", False)
+        head = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n1 0 obj\n<< /Type /Catalog >>\nendobj\n"
+        assert is_text_file(tmp_path / "a.dat", head) == (False, None)
+
+    def test_ascii_skips_detector(self, tmp_path, monkeypatch):
+        """ASCIIのみのファイルは文字コード判定器を使わずにASCIIと判定すること"""
+        def fail(*args, **kwargs):
+            raise AssertionError("detector should not be used")
+        monkeypatch.setattr(file_processor, "UniversalDetector", fail)
+        monkeypatch.setattr(file_processor, "HAS_CCHARDET", False)
+        assert is_text_file(tmp_path / "a.txt", b"plain ascii\ttext\r\n" * 100) == (True, "ascii")
+
+    def test_utf8_skips_detector(self, tmp_path, monkeypatch):
+        """BOMなしでUTF-8として読めるファイルは文字コード判定器を使わずにUTF-8と判定すること"""
+        def fail(*args, **kwargs):
+            raise AssertionError("detector should not be used")
+        monkeypatch.setattr(file_processor, "UniversalDetector", fail)
+        monkeypatch.setattr(file_processor, "HAS_CCHARDET", False)
+        data = ("日本語のテキストです。" * 300).encode("utf-8")
+        assert is_text_file(tmp_path / "a.txt", data[:7999]) == (True, "utf-8")
+
+    def test_shift_jis_uses_detector(self, tmp_path):
+        """UTF-8として読めないファイルは文字コード判定器で判定すること"""
+        data = ("日本語のテキストです。" * 300).encode("cp932")
+        is_text, encoding = is_text_file(tmp_path / "a.txt", data[:8000])
+        assert is_text is True
+        assert encoding != "utf-8"
+
+    def test_utf16_with_bom_is_text(self, tmp_path):
+        """BOM付きUTF-16はNULバイトを含んでもテキストと判定すること"""
+        path = tmp_path / "a.txt"
+        path.write_bytes("hello world, テスト".encode("utf-16"))
+        assert is_text_file(path)[0] is True
+
+    def test_head_cut_in_multibyte_char(self, tmp_path):
+        """先頭バッファの末尾でマルチバイト文字が切れていてもテキストと判定すること"""
+        path = tmp_path / "a.txt"
+        data = ("日本語のテキストです。" * 300).encode("utf-8")
+        path.write_bytes(data)
+        head = data[:7999]
+        assert is_text_file(path, head)[0] is True
+
+
+class TestGetMimeType:
+    """get_mime_type関数のテスト"""
+
+    @pytest.fixture
+    def detector(self, monkeypatch):
+        detector = _CountingDetector()
+        monkeypatch.setattr(file_processor, "_get_mime_detector", lambda: detector)
+        monkeypatch.setattr(file_processor, "_mime_cache", {})
+        return detector
+
+    def test_cached_per_file(self, tmp_path, detector):
+        """同じファイルは再判定しないこと"""
+        path = tmp_path / "a.txt"
+        path.write_text("hello", encoding="utf-8")
+        assert get_mime_type(path) == "text/plain"
+        assert get_mime_type(path, b"hello") == "text/plain"
+        assert detector.calls == 1
+
+    def test_invalidated_on_change(self, tmp_path, detector):
+        """ファイルが変更されたら再判定すること"""
+        path = tmp_path / "a.txt"
+        path.write_text("hello", encoding="utf-8")
+        get_mime_type(path)
+        path.write_text("hello, world", encoding="utf-8")
+        os.utime(path, ns=(0, 0))
+        get_mime_type(path)
+        assert detector.calls == 2
@@ -0,0 +1,85 @@
+"""scan_cacheモジュールのユニットテスト"""
+
+import json
+import os
+
+from notebooklm_loader.scan_cache import SCAN_CACHE_FILE, ScanCache
+
+
+class TestScanCache:
+    """ScanCache クラスのテスト"""
+
+    def test_roundtrip(self, tmp_path):
+        """保存した判定結果を次回の実行で再利用できること"""
+        path = tmp_path / "a.txt"
+        path.write_text("hello", encoding="utf-8")
+        cache_file = tmp_path / SCAN_CACHE_FILE
+        cache = ScanCache(tmp_path)
+        cache.put(path, text_encoding="ascii")
+        cache.save(cache_file)
+
+        loaded = ScanCache.load(cache_file, tmp_path)
+        assert loaded.get(path)["text_encoding"] == "ascii"
+
+    def test_miss_on_change(self, tmp_path):
+        """ファイルが変更されたら判定結果を返さないこと"""
+        path = tmp_path / "a.txt"
+        path.write_text("hello", encoding="utf-8")
+        cache = ScanCache(tmp_path)
+        cache.put(path, text_encoding="ascii")
+        path.write_text("hello, world", encoding="utf-8")
+        os.utime(path, ns=(0, 0))
+        assert cache.get(path) is None
+
+    def test_outside_root_not_cached(self, tmp_path):
+        """ルート外のファイルはキャッシュしないこと"""
+        root = tmp_path / "root"
+        root.mkdir()
+        path = tmp_path / "other.txt"
+        path.write_text("hello", encoding="utf-8")
+        cache = ScanCache(root)
+        cache.put(path, text_encoding="ascii")
+        assert cache.entries == {}
+        assert cache.get(path) is None
+
+    def test_save_drops_unseen_entries(self, tmp_path):
+        """今回参照しなかったファイル（削除されたファイルなど）は保存しないこと"""
+        path = tmp_path / "a.txt"
+        path.write_text("hello", encoding="utf-8")
+        cache_file = tmp_path / SCAN_CACHE_FILE
+        cache = ScanCache(tmp_path, {"gone.txt": {"mtime_ns": 0, "size": 0}})
+        cache.put(path, text_encoding="ascii")
+        cache.save(cache_file)
+
+        data = json.loads(cache_file.read_text(encoding="utf-8"))
+        assert list(data["entries"]) == ["a.txt"]
+
+    def test_load_broken_file(self, tmp_path):
+        """壊れたキャッシュファイルは空のキャッシュとして読み込むこと"""
+        cache_file = tmp_path / SCAN_CACHE_FILE
+        cache_file.write_text("{broken", encoding="utf-8")
+        assert ScanCache.load(cache_file, tmp_path).entries == {}
+
+    def test_output_reused_only_for_same_source(self, tmp_path):
+        """出力名は前回と同じ元ファイルの場合だけ再利用でき、同じ実行内で重複したら記録を消すこと"""
+        a = tmp_path / "a.png"
+        b = tmp_path / "b.png"
+        a.write_bytes(b"a")
+        b.write_bytes(b"b")
+        cache_file = tmp_path / SCAN_CACHE_FILE
+        cache = ScanCache(tmp_path)
+        cache.claim_output("x.pdf", a)
+        assert not cache.reusable_output("x.pdf")
+        cache.record_output("x.pdf")
+        cache.save(cache_file)
+
+        cache = ScanCache.load(cache_file, tmp_path)
+        cache.claim_output("x.pdf", b)
+        assert not cache.reusable_output("x.pdf")
+        cache = ScanCache.load(cache_file, tmp_path)
+        cache.claim_output("x.pdf", a)
+        assert cache.reusable_output("x.pdf")
+        cache.claim_output("x.pdf", b)
+        assert not cache.reusable_output("x.pdf")
+        cache.record_output("x.pdf")
+        assert cache.outputs == {}
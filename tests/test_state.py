@@ -0,0 +1,20 @@
+"""stateモジュールのユニットテスト"""
+
+import hashlib
+
+from notebooklm_loader.state import HASH_BUFFER_SIZE, ProcessingState
+
+
+class TestGetFileHash:
+    """ProcessingState.get_file_hash のテスト"""
+
+    def test_matches_sha256(self, tmp_path):
+        """読み込み単位をまたぐファイルでもファイル全体のSHA256と一致すること"""
+        path = tmp_path / "a.bin"
+        data = bytes(range(256)) * (HASH_BUFFER_SIZE // 256 * 2 + 3)
+        path.write_bytes(data)
+        assert ProcessingState().get_file_hash(path) == hashlib.sha256(data).hexdigest()
+
+    def test_missing_file(self, tmp_path):
+        """存在しないファイルは空文字列を返すこと"""
+        assert ProcessingState().get_file_hash(tmp_path / "missing.bin") == ""
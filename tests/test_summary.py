@@ -0,0 +1,33 @@
+"""summaryモジュールのユニットテスト"""
+
+import json
+
+from notebooklm_loader.summary import FileResult, ProcessingSummary
+
+
+class TestProcessingSummarySave:
+    """ProcessingSummary.save のテスト"""
+
+    def _summary(self):
+        summary = ProcessingSummary(target_path="/data")
+        summary.add_result(FileResult(path="a.docx", status="converted", output="a.md", file_type=".docx"))
+        summary.add_result(FileResult(path="日本語.zip", status="password_protected", file_type=".zip"))
+        return summary
+
+    def test_compact_by_default(self, tmp_path):
+        """デフォルトはインデントなしで保存すること"""
+        path = self._summary().save(tmp_path)
+        text = path.read_text(encoding="utf-8")
+        assert "\n" not in text
+        data = json.loads(text)
+        assert data["total_files"] == 2
+        assert data["files"][1]["path"] == "日本語.zip"
+
+    def test_pretty(self, tmp_path):
+        """pretty=True でもデフォルトと同じ内容を保存すること"""
+        summary = self._summary()
+        compact = json.loads(summary.save(tmp_path).read_text(encoding="utf-8"))
+        path = summary.save(tmp_path, pretty=True)
+        text = path.read_text(encoding="utf-8")
+        assert "\n  " in text
+        assert json.loads(text) == compact
@@ -1,8 +1,13 @@
 # tests/test_utils.py
 """utilsモジュールのユニットテスト"""
 
+import os
+
 import pytest
-from notebooklm_loader.utils import sanitize_content, sanitize_filename, get_output_filename, INVISIBLE_CHARS
+from notebooklm_loader.utils import (
+    sanitize_content, sanitize_filename, get_output_filename, make_output_namer, fast_copy, link_or_copy,
+    relative_path_str, INVISIBLE_CHARS
+)
 from pathlib import Path
 
 
@@ -126,3 +131,129 @@ class TestGetOutputFilename:
         file = Path("/root/folder/document.pptx")
         result = get_output_filename(root, file, ".pdf")
         assert result.endswith(".pdf")
+
+
+class TestMakeOutputNamer:
+    """make_output_namer関数のテスト"""
+    
+    @pytest.mark.parametrize("file", [
+        "/root/folder/subfolder/file.docx",
+        "/root/folder/file.docx",
+        "/root/folder/a/b/archive.tar.gz",
+        "/root/folder/a/b:c/file?.txt",
+        "/other/place/file.docx",
+    ])
+    def test_matches_get_output_filename(self, file):
+        """get_output_filenameと同じ結果を返すこと"""
+        root = Path("/root/folder")
+        namer = make_output_namer(root)
+        for ext in (".md", ".pdf"):
+            assert namer(Path(file), ext) == get_output_filename(root, Path(file), ext)
+    
+    def test_default_extension(self):
+        """デフォルト拡張子は.mdであること"""
+        namer = make_output_namer(Path("/root/folder"))
+        assert namer(Path("/root/folder/sub/file.docx")) == "sub_file.md"
+
+
+class TestRelativePathStr:
+    """relative_path_str関数のテスト"""
+    
+    @pytest.mark.parametrize("root, file", [
+        ("/root/folder", "/root/folder/sub/file.docx"),
+        ("/root/folder", "/root/folder/file.docx"),
+        (".", "sub/file.docx"),
+        ("/", "/etc/file.txt"),
+    ])
+    def test_matches_relative_to(self, root, file):
+        """relative_toと同じ相対パスを返すこと"""
+        assert relative_path_str(Path(root), Path(file)) == str(Path(file).relative_to(Path(root)))
+    
+    @pytest.mark.parametrize("file", ["/other/place/file.docx", "/root/folder", "/root/folder2/file.docx"])
+    def test_outside_root(self, file):
+        """ルート外（ルート自身を含む）ならNoneを返すこと"""
+        assert relative_path_str(Path("/root/folder"), Path(file)) is None
+
+
+class TestFastCopy:
+    """fast_copy関数のテスト"""
+    
+    def test_copies_content_and_mtime(self, tmp_path):
+        """内容と更新日時がコピーされること"""
+        import os
+        src = tmp_path / "src.pdf"
+        src.write_bytes(b"%PDF" + bytes(range(256)) * 5000)
+        os.utime(src, (1_000_000_000, 1_000_000_000))
+        dst = tmp_path / "dst.pdf"
+        fast_copy(src, dst)
+        assert dst.read_bytes() == src.read_bytes()
+        assert dst.stat().st_mtime == src.stat().st_mtime
+    
+    def test_overwrites_existing(self, tmp_path):
+        """既存ファイルを上書きすること"""
+        src = tmp_path / "src.txt"
+        src.write_bytes(b"new")
+        dst = tmp_path / "dst.txt"
+        dst.write_bytes(b"old content that is longer")
+        fast_copy(src, dst)
+        assert dst.read_bytes() == b"new"
+
+
+class TestLinkOrCopy:
+    """link_or_copy関数のテスト"""
+    
+    def test_creates_hardlink(self, tmp_path):
+        """同一FS上ではハードリンクを作成すること"""
+        src = tmp_path / "a.pdf"
+        src.write_bytes(b"%PDF-1.4")
+        dst = tmp_path / "b.pdf"
+        link_or_copy(src, dst)
+        assert dst.read_bytes() == b"%PDF-1.4"
+        assert dst.stat().st_ino == src.stat().st_ino
+    
+    def test_replaces_existing_without_touching_old_inode(self, tmp_path):
+        """既存のdstを置き換え、古いリンク先の内容は変更しないこと"""
+        old = tmp_path / "old.pdf"
+        old.write_bytes(b"old")
+        dst = tmp_path / "dst.pdf"
+        link_or_copy(old, dst)
+        src = tmp_path / "new.pdf"
+        src.write_bytes(b"new")
+        link_or_copy(src, dst)
+        assert dst.read_bytes() == b"new"
+        assert old.read_bytes() == b"old"
+    
+    @pytest.mark.parametrize("mode", ["hardlink", "symlink", "copy"])
+    def test_relink_leaves_no_temp_files(self, tmp_path, mode):
+        """既存のdstを置き換えても一時ファイルが残らないこと（同じリンクの再作成を含む）"""
+        src = tmp_path / "a.pdf"
+        src.write_bytes(b"%PDF-1.4")
+        dst = tmp_path / "b.pdf"
+        for _ in range(2):
+            link_or_copy(src, dst, mode)
+        assert dst.read_bytes() == b"%PDF-1.4"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.pdf", "b.pdf"]
+    
+    def test_symlink_mode(self, tmp_path):
+        """symlinkモードでは相対パスのシンボリックリンクを作成すること"""
+        (tmp_path / "out").mkdir()
+        (tmp_path / "merged").mkdir()
+        src = tmp_path / "out" / "a.pdf"
+        src.write_bytes(b"%PDF-1.4")
+        dst = tmp_path / "merged" / "a.pdf"
+        link_or_copy(src, dst, mode="symlink")
+        assert os.readlink(dst) == os.path.join("..", "out", "a.pdf")
+        assert dst.read_bytes() == b"%PDF-1.4"
+    
+    def test_copy_mode_replaces_existing_link(self, tmp_path):
+        """copyモードで既存のリンクを置き換えてもリンク元を書き換えないこと"""
+        old = tmp_path / "old.pdf"
+        old.write_bytes(b"old")
+        dst = tmp_path / "merged.pdf"
+        link_or_copy(old, dst)
+        src = tmp_path / "new.pdf"
+        src.write_bytes(b"new")
+        link_or_copy(src, dst, mode="copy")
+        assert dst.read_bytes() == b"new"
+        assert dst.stat().st_ino != src.stat().st_ino
+        assert old.read_bytes() == b"old"
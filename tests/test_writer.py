@@ -0,0 +1,57 @@
+"""writerモジュールのユニットテスト"""
+
+import pytest
+from pathlib import Path
+from notebooklm_loader.writer import BackgroundWriter
+from notebooklm_loader.summary import FileResult
+
+
+class TestBackgroundWriter:
+    """BackgroundWriter クラスのテスト"""
+    
+    def test_writes_files(self, tmp_path):
+        """キューに積んだ内容がファイルに書き出されること"""
+        writer = BackgroundWriter()
+        futures = [
+            writer.submit(tmp_path / f"file{i}.md", f"content {i}".encode('utf-8'),
+                          FileResult(path=f"src{i}", status="converted"))
+            for i in range(10)
+        ]
+        writer.close()
+        results = [f.result() for f in futures]
+        
+        for i in range(10):
+            assert (tmp_path / f"file{i}.md").read_text(encoding='utf-8') == f"content {i}"
+        assert [r.path for r in results] == [f"src{i}" for i in range(10)]
+        assert all(r.status == "converted" for r in results)
+    
+    def test_write_error_recorded(self, tmp_path):
+        """書き込み失敗がerrorとして記録されること"""
+        writer = BackgroundWriter()
+        future = writer.submit(tmp_path / "missing_dir" / "file.md", b"data",
+                               FileResult(path="src", status="converted", file_type=".txt"))
+        writer.close()
+        result = future.result()
+        
+        assert result.status == "error"
+        assert result.file_type == ".txt"
+        assert result.error_message
+    
+    def test_writes_chunks(self, tmp_path):
+        """バイト列の並びを順に書き出すこと"""
+        writer = BackgroundWriter()
+        writer.submit(tmp_path / "file.md", (b"# header\n", "本文".encode('utf-8'), b"\n---\n"),
+                      FileResult(path="src", status="converted"))
+        writer.close()
+        
+        assert (tmp_path / "file.md").read_text(encoding='utf-8') == "# header\n本文\n---\n"
+    
+    def test_last_write_wins(self, tmp_path):
+        """同じ出力先への書き込みは後に投入した内容が残ること"""
+        writer = BackgroundWriter()
+        for i in range(20):
+            writer.submit(tmp_path / "same.md", f"content {i}".encode('utf-8'),
+                          FileResult(path=f"src{i}", status="converted"))
+        writer.close()
+        
+        assert (tmp_path / "same.md").read_text(encoding='utf-8') == "content 19"